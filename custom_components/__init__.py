@@ -0,0 +1 @@
+"""Custom integrations of this repository."""
@@ -1,16 +1,27 @@
 """Support for Paradox devices."""
 import asyncio
 import logging
-from typing import cast
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple, cast
 from datetime import timedelta
-from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.const import CONF_SCAN_INTERVAL, CONF_DEVICE
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import HomeAssistantType
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+import homeassistant.util.dt as dt_util
 
-from .const import (DOMAIN, CONF_MODEL, CONF_MODULE, DEFAULT_SCAN_INTERVAL, CONF_ALARM_CONTROL_PANEL)
+from .const import (DOMAIN, CONF_MODEL, CONF_MODULE, CONF_HUB, DATA_COORDINATOR, CONF_FAST_SCAN_WINDOW,
+                    CONF_MAX_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, DEFAULT_FAST_SCAN_INTERVAL, DEFAULT_FAST_SCAN_WINDOW,
+                    DEFAULT_MAX_SCAN_INTERVAL,
+                    DEFAULT_IDLE_CYCLES, CONF_ALARM_CONTROL_PANEL, CONF_SENSOR,
+                    SIGNAL_ALARM_PANEL_UPDATE, SIGNAL_ALARM_TRIGGERED, STATUS_AREAS, STATUS_ZONES, STATUS_PGMS,
+                    STATUS_ID_KEYS, DEFAULT_CONNECT_RETRY)
 from .device import ParadoxDevice
+from .hub import ParadoxHub
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,34 +34,86 @@ async def async_setup(hass: HomeAssistantType, config: dict):
 async def async_setup_entry(hass: HomeAssistantType, entry: ConfigEntry) -> bool:
     """Set up Paradox from a config entry."""
     if DOMAIN not in hass.data:
-        hass.data[DOMAIN] = {}
+        hass.data[DOMAIN] = {
+            CONF_HUB: ParadoxHub()
+        }
+    hub = cast(ParadoxHub, hass.data[DOMAIN][CONF_HUB])
 
     module = ParadoxDevice(hass, entry)
-    if not await module.async_setup():
-        return False
 
-    if not module.available:
-        raise ConfigEntryNotReady()
+    # Fast start: when the module was set up before, create the entities from the saved data
+    # and connect in the background instead of blocking the boot on the network.
+    fast_start = await module.async_restore()
+    if not fast_start:
+        if not await module.async_setup():
+            await module.async_unload()
+            return False
+
+        if not module.available:
+            await module.async_unload()
+            raise ConfigEntryNotReady()
 
     platforms = module.platforms
     hass.data[DOMAIN][entry.unique_id] = {
         CONF_MODULE: module
     }
 
-    if CONF_ALARM_CONTROL_PANEL in platforms:
-        scan_interval = entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-        coordinator = ParadoxAlarmPanelUpdateCoordinator(hass, module, scan_interval)
-        await coordinator.async_refresh()
-        hass.data[DOMAIN][entry.unique_id][CONF_ALARM_CONTROL_PANEL] = coordinator
+    coordinator = None
+    if module.has_alarm_panel:
+        options = entry.options.get(CONF_DEVICE, {})
+        scan_interval = options.get(CONF_SCAN_INTERVAL, entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+        fast_scan_window = options.get(CONF_FAST_SCAN_WINDOW, DEFAULT_FAST_SCAN_WINDOW)
+        max_scan_interval = options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+        coordinator = ParadoxAlarmPanelUpdateCoordinator(hass, module, hub, scan_interval, fast_scan_window,
+                                                         max_scan_interval)
+        if fast_start:
+            coordinator.async_restore(module.cached_alarm_panel)
+        else:
+            await coordinator.async_refresh()
+        hass.data[DOMAIN][entry.unique_id][DATA_COORDINATOR] = coordinator
 
-    for component in platforms:
+    hub.register(entry.unique_id, module, coordinator)
+
+    # The diagnostic sensors are added to every module
+    for component in platforms + [CONF_SENSOR]:
         hass.async_create_task(
             hass.config_entries.async_forward_entry_setup(entry, component)
         )
 
+    if fast_start:
+        hass.async_create_task(async_connect(hass, entry, module, coordinator))
+    else:
+        module.async_update_cache(coordinator.data if coordinator else None)
+
     return True
 
 
+async def async_connect(hass: HomeAssistantType, entry: ConfigEntry, module: ParadoxDevice,
+                        coordinator: Optional['ParadoxAlarmPanelUpdateCoordinator'], now=None) -> None:
+    """Connect to a module whose entities were restored from the saved data."""
+    data = hass.data.get(DOMAIN, {}).get(entry.unique_id)
+    if data is None or data[CONF_MODULE] is not module:
+        # The entry was unloaded meanwhile
+        return
+
+    if not await module.async_setup():
+        return
+
+    if not module.available:
+        async_call_later(hass, DEFAULT_CONNECT_RETRY, partial(async_connect, hass, entry, module, coordinator))
+        return
+
+    if coordinator is not None:
+        await coordinator.async_refresh()
+
+    module.async_update_cache(coordinator.data if coordinator else None)
+
+
+async def async_remove_entry(hass: HomeAssistantType, entry: ConfigEntry) -> None:
+    """Remove the saved data of a config entry."""
+    await ParadoxDevice(hass, entry).async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistantType, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     module = cast(ParadoxDevice, hass.data[DOMAIN][entry.unique_id][CONF_MODULE])
@@ -60,24 +123,56 @@ async def async_unload_entry(hass: HomeAssistantType, entry: ConfigEntry) -> boo
         await asyncio.gather(
             *[
                 hass.config_entries.async_forward_entry_unload(entry, component)
-                for component in platforms
+                for component in platforms + [CONF_SENSOR]
             ]
         )
     )
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.unique_id)
+        data = hass.data[DOMAIN].pop(entry.unique_id)
+        hass.data[DOMAIN][CONF_HUB].unregister(entry.unique_id)
+        await data[CONF_MODULE].async_unload()
+        if DATA_COORDINATOR in data:
+            data[DATA_COORDINATOR].async_unload()
 
     return unload_ok
 
 
 class ParadoxAlarmPanelUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching alarm panel data."""
+    """Class to manage fetching alarm panel data.
+
+    Data pushed by the module (see ParadoxDevice.async_push_alarm_panel) is applied as soon as it
+    arrives, polling remains as a fallback to keep the entities alive.
 
-    def __init__(self, hass: HomeAssistantType, module: ParadoxDevice, scan_interval: int):
+    The polling interval is adaptive: it drops to a fast interval for a while after a command is
+    sent or while any area is arming, and backs off exponentially up to a ceiling when the areas
+    and zones have not changed for a few cycles. Updates go through the hub, which jitters the
+    interval and limits how many modules are polled at the same time.
+
+    Entities subscribe to a single area, zone or PGM (e.g. with async_add_area_listener) and are only
+    notified when it changed, instead of every entity writing its state on every refresh.
+    """
+
+    def __init__(self, hass: HomeAssistantType, module: ParadoxDevice, hub: ParadoxHub, scan_interval: int,
+                 fast_scan_window: int = DEFAULT_FAST_SCAN_WINDOW,
+                 max_scan_interval: int = DEFAULT_MAX_SCAN_INTERVAL):
         """Initialize alarm panel data updater."""
 
         self.device = module
-        interval = timedelta(seconds=scan_interval)
+        self._hub = hub
+        self._scan_interval = timedelta(seconds=scan_interval)
+        self._fast_scan_interval = timedelta(seconds=DEFAULT_FAST_SCAN_INTERVAL)
+        self._fast_scan_window = timedelta(seconds=fast_scan_window)
+        self._max_scan_interval = timedelta(seconds=max(scan_interval, max_scan_interval))
+        self._fast_scan_until = None
+        self._idle_cycles = 0
+        self._indexes: Dict[str, Dict[int, dict]] = {}
+        self._indexes_data: Optional[dict] = None
+        self._notified: Dict[str, Dict[int, dict]] = {}
+        self._item_listeners: Dict[Tuple[str, int], List[CALLBACK_TYPE]] = {}
+        self._unsub_item_listeners: Optional[CALLBACK_TYPE] = None
+        self._last_update_success = True
+
+        interval = self._scan_interval
         super().__init__(
             hass,
             _LOGGER,
@@ -85,6 +180,186 @@ class ParadoxAlarmPanelUpdateCoordinator(DataUpdateCoordinator):
             update_interval=interval,
         )
 
+        self._unsub_push = async_dispatcher_connect(
+            hass,
+            SIGNAL_ALARM_PANEL_UPDATE.format(module.config_entry.unique_id),
+            self._async_handle_push
+        )
+
+    @callback
+    def async_restore(self, data: Optional[dict]) -> None:
+        """Use data restored from the saved data until the module answers."""
+        self.data = data or {}
+        self.last_update_success = False
+
+    @callback
+    def _async_handle_push(self, data: dict) -> None:
+        """Handle alarm panel data pushed by the module."""
+        self._async_adjust_update_interval(data)
+        self._async_check_alarm(data)
+        self.async_set_updated_data(data)
+
+    @callback
+    def _async_check_alarm(self, data: Optional[dict]) -> None:
+        """Signal the areas that went into alarm since the last update.
+
+        Only areas the module reported out of alarm before are signaled, the topology restored at
+        startup has no alarm state and an alarm already active then is not a transition.
+        """
+        previous = self.areas
+        for area in (data or {}).get(STATUS_AREAS, []):
+            area_id = area.get(STATUS_ID_KEYS[STATUS_AREAS])
+            previous_area = previous.get(area_id, {})
+            if area.get('InAlarm') and 'InAlarm' in previous_area and not previous_area['InAlarm']:
+                async_dispatcher_send(
+                    self.hass, SIGNAL_ALARM_TRIGGERED.format(self.device.config_entry.unique_id), area_id
+                )
+
+    def _index(self, status: str) -> Dict[int, dict]:
+        """Return the items of a status list of the last update indexed by id.
+
+        The index is built once per update and references the items of the payload.
+        """
+        if self._indexes_data is not self.data:
+            self._indexes_data = self.data
+            self._indexes = {}
+
+        if status not in self._indexes:
+            id_key = STATUS_ID_KEYS[status]
+            self._indexes[status] = {
+                item[id_key]: item
+                for item in (self.data or {}).get(status, [])
+            }
+
+        return self._indexes[status]
+
+    @property
+    def areas(self) -> Dict[int, dict]:
+        """Return the areas of the last update indexed by AreaId."""
+        return self._index(STATUS_AREAS)
+
+    @property
+    def zones(self) -> Dict[int, dict]:
+        """Return the zones of the last update indexed by ZoneId."""
+        return self._index(STATUS_ZONES)
+
+    @property
+    def pgms(self) -> Dict[int, dict]:
+        """Return the PGMs of the last update indexed by PGMId."""
+        return self._index(STATUS_PGMS)
+
+    @property
+    def fast_scan_window(self) -> timedelta:
+        """Return how long the coordinator polls fast after a command."""
+        return self._fast_scan_window
+
+    @callback
+    def async_fast_poll(self) -> None:
+        """Poll fast for a while, e.g. after a command was sent to the module.
+
+        The module pushes the panel state once the command is sent, which reschedules the next
+        poll at the fast interval, even after an idle backoff.
+        """
+        self._fast_scan_until = dt_util.utcnow() + self._fast_scan_window
+        self._idle_cycles = 0
+
+    @callback
+    def async_add_area_listener(self, area_id: int, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for data updates of a single area."""
+        return self._async_add_item_listener(STATUS_AREAS, area_id, update_callback)
+
+    @callback
+    def async_add_zone_listener(self, zone_id: int, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for data updates of a single zone."""
+        return self._async_add_item_listener(STATUS_ZONES, zone_id, update_callback)
+
+    @callback
+    def async_add_pgm_listener(self, pgm_id: int, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for data updates of a single PGM."""
+        return self._async_add_item_listener(STATUS_PGMS, pgm_id, update_callback)
+
+    @callback
+    def _async_add_item_listener(self, status: str, item_id: int,
+                                 update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for data updates of a single item of a status list."""
+        if not self._item_listeners:
+            self._unsub_item_listeners = self.async_add_listener(self._async_update_item_listeners)
+
+        key = (status, item_id)
+        self._item_listeners.setdefault(key, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove update listener."""
+            listeners = self._item_listeners.get(key, [])
+            if update_callback in listeners:
+                listeners.remove(update_callback)
+            if not listeners:
+                self._item_listeners.pop(key, None)
+            if not self._item_listeners and self._unsub_item_listeners is not None:
+                self._unsub_item_listeners()
+                self._unsub_item_listeners = None
+
+        return remove_listener
+
+    @callback
+    def _async_update_item_listeners(self) -> None:
+        """Notify only the listeners of the items that changed since the last update."""
+        availability_changed = self.last_update_success != self._last_update_success
+        self._last_update_success = self.last_update_success
+
+        indexes = {status: self._index(status) for status in STATUS_ID_KEYS}
+        for (status, item_id), listeners in list(self._item_listeners.items()):
+            current = indexes[status].get(item_id)
+            if availability_changed or current != self._notified.get(status, {}).get(item_id):
+                for update_callback in list(listeners):
+                    update_callback()
+
+        self._notified = indexes
+
+    @callback
+    def async_unload(self) -> None:
+        """Stop receiving pushed alarm panel data."""
+        self._unsub_push()
+
+    @callback
+    def _async_adjust_update_interval(self, data: Optional[dict]) -> None:
+        """Choose the next polling interval from the new data."""
+        data = data or {}
+        areas = data.get(STATUS_AREAS, [])
+        if self.data is not None and all(data.get(status) == self.data.get(status) for status in STATUS_ID_KEYS):
+            self._idle_cycles += 1
+        else:
+            self._idle_cycles = 0
+
+        fast_scan = self._fast_scan_until is not None and dt_util.utcnow() < self._fast_scan_until
+        arming = any(area.get('ArmingLevelID') == 5 for area in areas)
+
+        if fast_scan or arming:
+            interval = self._fast_scan_interval
+        elif self._idle_cycles >= DEFAULT_IDLE_CYCLES:
+            backoff = 2 ** min(self._idle_cycles - DEFAULT_IDLE_CYCLES + 1, 8)
+            interval = min(self._scan_interval * backoff, self._max_scan_interval)
+        else:
+            interval = self._scan_interval
+
+        self.update_interval = self._hub.jitter(interval)
+
     async def _async_update_data(self):
         """Fetch data from Paradox module."""
-        return await self.device.async_update_alarm_panel()
+        if not self.device.connected:
+            # Restored at startup, async_connect refreshes once the module is set up
+            raise UpdateFailed(f"Module '{self.device.name}' is not connected yet")
+
+        try:
+            data = await self._hub.async_update(self.device.async_update_alarm_panel)
+        except UpdateFailed:
+            # Don't hammer a module that is not answering
+            self._idle_cycles = 0
+            self.update_interval = self._hub.jitter(self._scan_interval)
+            raise
+
+        self._async_adjust_update_interval(data)
+        self._async_check_alarm(data)
+        self.device.async_update_cache(data)
+        return data
@@ -20,9 +20,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.typing import HomeAssistantType, StateType
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN, CONF_MODULE, CONF_ALARM_CONTROL_PANEL
+from . import ParadoxAlarmPanelUpdateCoordinator
+from .const import DOMAIN, CONF_MODULE, CONF_ALARM_CONTROL_PANEL, DATA_COORDINATOR
 from .device import ParadoxDevice
 
 _LOGGER = logging.getLogger(__name__)
@@ -34,7 +34,10 @@ async def async_setup_entry(
         async_add_entities: Callable[[List[Entity], bool], None]) -> None:
     """Set up the Paradox alarm panel."""
     module = cast(ParadoxDevice, hass.data[DOMAIN][config_entry.unique_id][CONF_MODULE])
-    coordinator = cast(DataUpdateCoordinator, hass.data[DOMAIN][config_entry.unique_id][CONF_ALARM_CONTROL_PANEL])
+    coordinator = cast(
+        ParadoxAlarmPanelUpdateCoordinator,
+        hass.data[DOMAIN][config_entry.unique_id][DATA_COORDINATOR]
+    )
 
     partitions = coordinator.data.get('AreaStatus', [])
     entities = [
@@ -47,21 +50,20 @@ async def async_setup_entry(
 
 class ParadoxAlarmEntity(alarm.AlarmControlPanelEntity):
 
-    def __init__(self, device: ParadoxDevice, coordinator: DataUpdateCoordinator, partition_id: int) -> None:
+    def __init__(self, device: ParadoxDevice, coordinator: ParadoxAlarmPanelUpdateCoordinator,
+                 partition_id: int) -> None:
         """Initialize Paradox camera entity."""
         self.device = device
         self._coordinator = coordinator
         self._partition_id = partition_id
+        self._partition: dict = {}
 
         self._get_partition_from_coordinator()
 
     def _get_partition_from_coordinator(self) -> None:
-        partitions = self._coordinator.data.get('AreaStatus', [])
-        for partition in partitions:
-            if partition['AreaId'] == self._partition_id:
-                self._partition = partition
-                return
+        self._partition = self._coordinator.areas.get(self._partition_id, self._partition)
 
+    @property
     def should_poll(self) -> bool:
         """Not needed. Update from Data Coordinator"""
         return False
@@ -81,19 +83,19 @@ class ParadoxAlarmEntity(alarm.AlarmControlPanelEntity):
         """Return the state of the entity."""
         self._get_partition_from_coordinator()
 
-        if self._partition['InAlarm']:
+        if self._partition.get('InAlarm'):
             return STATE_ALARM_TRIGGERED
 
-        if self._partition['ArmingLevelID'] == 0:
+        if self._partition.get('ArmingLevelID') == 0:
             return STATE_ALARM_DISARMED
 
-        if self._partition['ArmingLevelID'] == 1:
+        if self._partition.get('ArmingLevelID') == 1:
             return STATE_ALARM_ARMED_AWAY
 
-        if self._partition['ArmingLevelID'] == 3:
+        if self._partition.get('ArmingLevelID') == 3:
             return STATE_ALARM_ARMED_HOME
 
-        if self._partition['ArmingLevelID'] == 5:
+        if self._partition.get('ArmingLevelID') == 5:
             return STATE_ALARM_ARMING
 
         #if self._partition['ArmingLevelID'] == 0:
@@ -153,14 +155,10 @@ class ParadoxAlarmEntity(alarm.AlarmControlPanelEntity):
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
-        self._coordinator.async_add_listener(
-            self.async_write_ha_state
-        )
-
-    async def async_will_remove_from_hass(self):
-        """When entity will be removed from hass."""
-        self._coordinator.async_remove_listener(
-            self.async_write_ha_state
+        self.async_on_remove(
+            self._coordinator.async_add_area_listener(
+                self._partition_id, self.async_write_ha_state
+            )
         )
 
     async def async_alarm_disarm(self, code=None):
@@ -177,10 +175,5 @@ class ParadoxAlarmEntity(alarm.AlarmControlPanelEntity):
 
     async def _send_alarm_command(self, command: int, code=None):
         """Send alarm command."""
-        area_command = {
-            "AreaID": self._partition_id,
-            "AreaCommand": command,
-            "ForceZones": False,
-        }
-        await self.device.async_areacontrol([area_command])
-        await self._coordinator.async_request_refresh()
+        self._coordinator.async_fast_poll()
+        await self.device.async_queue_area_command(self._partition_id, command)
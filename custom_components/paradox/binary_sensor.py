@@ -0,0 +1,114 @@
+import logging
+from typing import Callable, List, Optional, Dict, Any, cast
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.typing import HomeAssistantType
+from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
+
+from . import ParadoxAlarmPanelUpdateCoordinator
+from .const import DOMAIN, CONF_MODULE, CONF_BINARY_SENSOR, DATA_COORDINATOR
+from .device import ParadoxDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+        hass: HomeAssistantType,
+        config_entry: ConfigEntry,
+        async_add_entities: Callable[[List[Entity], bool], None]) -> None:
+    """Set up the Paradox zones."""
+    module = cast(ParadoxDevice, hass.data[DOMAIN][config_entry.unique_id][CONF_MODULE])
+    coordinator = cast(
+        ParadoxAlarmPanelUpdateCoordinator,
+        hass.data[DOMAIN][config_entry.unique_id][DATA_COORDINATOR]
+    )
+
+    entities = [
+        ParadoxZoneEntity(module, coordinator, zone_id)
+        for zone_id in coordinator.zones
+    ]
+
+    async_add_entities(entities, False)
+
+
+class ParadoxZoneEntity(BinarySensorEntity):
+
+    def __init__(self, device: ParadoxDevice, coordinator: ParadoxAlarmPanelUpdateCoordinator,
+                 zone_id: int) -> None:
+        """Initialize Paradox zone entity."""
+        self.device = device
+        self._coordinator = coordinator
+        self._zone_id = zone_id
+        self._zone: dict = {}
+
+        self._get_zone_from_coordinator()
+
+    def _get_zone_from_coordinator(self) -> None:
+        self._zone = self._coordinator.zones.get(self._zone_id, self._zone)
+
+    @property
+    def should_poll(self) -> bool:
+        """Not needed. Update from Data Coordinator"""
+        return False
+
+    @property
+    def unique_id(self) -> Optional[str]:
+        """Return a unique ID."""
+        return f"{DOMAIN}-{self.device.panel_info.serial}-{CONF_BINARY_SENSOR}-{self._zone_id}".lower()
+
+    @property
+    def name(self) -> Optional[str]:
+        """Return the name of the entity."""
+        return str(self._zone.get('ZoneLabel')).strip()
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if the zone is open."""
+        self._get_zone_from_coordinator()
+
+        return bool(self._zone.get('Open'))
+
+    @property
+    def device_state_attributes(self):
+        """Return the state attributes."""
+        return {
+            "bypassed": bool(self._zone.get('Bypassed')),
+            "tampered": bool(self._zone.get('Tampered')),
+            "in_alarm": bool(self._zone.get('InAlarm')),
+        }
+
+    @property
+    def device_info(self) -> Optional[Dict[str, Any]]:
+        """Return device specific attributes."""
+        device_info = {
+            "via_device": (DOMAIN, self.device.device_info.mac or self.device.device_info.serial),
+            "name": self.device.panel_info.name,
+            "identifiers": {
+                # MAC address is not always available
+                (DOMAIN, self.device.panel_info.mac or self.device.panel_info.serial)
+            },
+            "manufacturer": self.device.panel_info.manufacturer,
+            "model": self.device.panel_info.model,
+            "sw_version": self.device.panel_info.sw_version,
+        }
+
+        if self.device.panel_info.mac:
+            device_info["connections"] = {
+                (CONNECTION_NETWORK_MAC, self.device.panel_info.mac)
+            }
+
+        return device_info
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return self.device.available and self._coordinator.last_update_success
+
+    async def async_added_to_hass(self):
+        """When entity is added to hass."""
+        self.async_on_remove(
+            self._coordinator.async_add_zone_listener(
+                self._zone_id, self.async_write_ha_state
+            )
+        )
@@ -1,27 +1,64 @@
 import asyncio
 import logging
-from typing import Callable, List, cast
-from haffmpeg.camera import CameraMjpeg
+import os
+from collections import deque
+from datetime import datetime, timedelta
+from time import monotonic, time
+from typing import Callable, Deque, List, Optional, cast
 from haffmpeg.tools import IMAGE_JPEG, ImageFrame
-from homeassistant.components.camera import SUPPORT_STREAM, Camera
-from homeassistant.components.ffmpeg import CONF_EXTRA_ARGUMENTS, DATA_FFMPEG
+from homeassistant.components.camera import SUPPORT_STREAM, Camera, async_get_still_stream
+from homeassistant.components.ffmpeg import CONF_EXTRA_ARGUMENTS, DATA_FFMPEG, DOMAIN as FFMPEG_DOMAIN
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
-from homeassistant.helpers.aiohttp_client import async_aiohttp_proxy_stream
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
 
-from .const import DOMAIN, CONF_MODULE, CONF_CAMERA
+from .const import (DOMAIN, CONF_MODULE, CONF_CAMERA, CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE,
+                    DEFAULT_SNAPSHOT_MAX_SIZE, CONF_STREAM_PROXY, DEFAULT_STREAM_PROXY, CONF_PRE_EVENT_FRAMES,
+                    DEFAULT_PRE_EVENT_FRAMES, DEFAULT_PRE_EVENT_INTERVAL, PRE_EVENT_DIRECTORY,
+                    DEFAULT_PRE_EVENT_RETENTION, EVENT_PRE_EVENT_SAVED, SIGNAL_ALARM_TRIGGERED)
+from .decoder import ParadoxCameraDecoder
 from .device import ParadoxDevice
+from .proxy import ParadoxStreamProxy, async_get_proxies
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def save_frames(directory: str, prefix: str, frames: List[bytes]) -> List[str]:
+    """Write the frames as JPEG files and return their paths. Frames older than the retention are removed."""
+    os.makedirs(directory, exist_ok=True)
+
+    expired = time() - DEFAULT_PRE_EVENT_RETENTION * 86400
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.name.endswith('.jpg') and entry.stat().st_mtime < expired:
+            os.remove(entry.path)
+
+    paths = []
+    for index, frame in enumerate(frames):
+        path = os.path.join(directory, f"{prefix}_{index:03d}.jpg")
+        with open(path, 'wb') as file:
+            file.write(frame)
+        paths.append(path)
+
+    return paths
+
+
 async def async_setup_entry(
         hass: HomeAssistantType,
         config_entry: ConfigEntry,
         async_add_entities: Callable[[List[Entity], bool], None]) -> None:
     """Set up the Paradox camera video stream."""
+    # ffmpeg is only needed by the camera, set it up on demand
+    if DATA_FFMPEG not in hass.data and not await async_setup_component(hass, FFMPEG_DOMAIN, {}):
+        _LOGGER.error("Couldn't set up ffmpeg, camera of '%s' is not available.", config_entry.title)
+        return
+
     module = cast(ParadoxDevice, hass.data[DOMAIN][config_entry.unique_id][CONF_MODULE])
 
     async_add_entities(
@@ -34,6 +71,13 @@ class ParadoxCameraEntity(Camera):
     def __init__(self, device: ParadoxDevice) -> None:
         """Initialize Paradox camera entity."""
         self.device = device
+        self._decoder: Optional[ParadoxCameraDecoder] = None
+        self._snapshot: Optional[bytes] = None
+        self._snapshot_time: float = 0
+        self._snapshot_task: Optional[asyncio.Future] = None
+        self._proxy: Optional[ParadoxStreamProxy] = None
+        self._pre_event_frames: Optional[Deque[bytes]] = None
+        self._pre_event_decoder: Optional[ParadoxCameraDecoder] = None
         Camera.__init__(self)
 
     @property
@@ -87,19 +131,153 @@ class ParadoxCameraEntity(Camera):
         """Return the camera model."""
         return self.device.device_info.model
 
+    @property
+    def device_state_attributes(self):
+        """Return the state attributes."""
+        return {
+            "profile": self.device.camera_profile,
+            "throughput": round(self.device.stream_throughput) if self.device.stream_throughput else None,
+        }
+
     async def stream_source(self):
         """Return the source of the stream."""
+        if self._proxy is not None:
+            url = self._proxy.url
+            if url is not None:
+                return url
+
+            _LOGGER.warning(
+                "Home Assistant has no internal url, camera '%s' is streamed without the proxy",
+                self.device.name
+            )
+
         return await self.device.async_stream_source()
 
+    @property
+    def decoder(self) -> ParadoxCameraDecoder:
+        """Return the decoder shared by the snapshots and MJPEG viewers of this camera."""
+        if self._decoder is None:
+            self._decoder = ParadoxCameraDecoder(
+                self.hass,
+                self.hass.data[DATA_FFMPEG].binary,
+                self.stream_source,
+                extra_cmd=self.device.config_entry.options.get(CONF_EXTRA_ARGUMENTS),
+            )
+
+        return self._decoder
+
+    async def async_added_to_hass(self):
+        """When entity is added to hass."""
+        self.async_on_remove(self.hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, self._async_stop_decoders))
+        options = self.device.config_entry.options.get(CONF_CAMERA, {})
+        pre_event_frames = options.get(CONF_PRE_EVENT_FRAMES, DEFAULT_PRE_EVENT_FRAMES)
+
+        # The adaptive profile measures the throughput of the segments going through the proxy, and
+        # the pre-event buffer shares its download with the viewers
+        if options.get(CONF_STREAM_PROXY, DEFAULT_STREAM_PROXY) or self.device.adaptive_stream or pre_event_frames:
+            self._proxy = ParadoxStreamProxy(self.hass, self.device)
+            async_get_proxies(self.hass)[self._proxy.token] = self._proxy
+
+        if pre_event_frames > 0:
+            self._pre_event_frames = deque(maxlen=pre_event_frames)
+            # The stream is downloaded for as long as the entity exists, but ffmpeg only outputs the
+            # frames that are buffered
+            extra_cmd = options.get(CONF_EXTRA_ARGUMENTS) or ''
+            self._pre_event_decoder = ParadoxCameraDecoder(
+                self.hass,
+                self.hass.data[DATA_FFMPEG].binary,
+                self.stream_source,
+                extra_cmd=f"{extra_cmd} -r {1 / DEFAULT_PRE_EVENT_INTERVAL:g}".strip(),
+            )
+            self._pre_event_decoder.acquire()
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass, self._async_buffer_frame, timedelta(seconds=DEFAULT_PRE_EVENT_INTERVAL)
+                )
+            )
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self.hass,
+                    SIGNAL_ALARM_TRIGGERED.format(self.device.config_entry.unique_id),
+                    self._async_save_pre_event_frames
+                )
+            )
+
+    async def async_will_remove_from_hass(self):
+        """When entity will be removed from hass."""
+        await self._async_stop_decoders()
+
+        if self._proxy is not None:
+            async_get_proxies(self.hass).pop(self._proxy.token, None)
+            self._proxy.clear()
+            self._proxy = None
+
+    async def _async_stop_decoders(self, event: Optional[Event] = None) -> None:
+        """Stop ffmpeg, entities are not removed when Home Assistant stops."""
+        if self._decoder is not None:
+            await self._decoder.async_stop()
+
+        if self._pre_event_decoder is not None:
+            await self._pre_event_decoder.async_stop()
+            self._pre_event_decoder = None
+
+    @callback
+    def _async_buffer_frame(self, now: datetime = None) -> None:
+        """Keep the last decoded frame in the pre-event buffer."""
+        if self._pre_event_decoder is None:
+            return
+
+        frame = self._pre_event_decoder.frame
+        if frame is None or len(frame) > DEFAULT_SNAPSHOT_MAX_SIZE:
+            return
+
+        if not self._pre_event_frames or self._pre_event_frames[-1] is not frame:
+            self._pre_event_frames.append(frame)
+
+    async def _async_save_pre_event_frames(self, area_id: int) -> None:
+        """Save the frames from before the alarm was triggered."""
+        self._async_buffer_frame()
+        frames = list(self._pre_event_frames)
+        if not frames:
+            return
+
+        directory = self.hass.config.path(PRE_EVENT_DIRECTORY, self.device.device_info.serial)
+        prefix = f"{dt_util.now().strftime('%Y%m%d_%H%M%S')}_area{area_id}"
+        paths = await self.hass.async_add_executor_job(save_frames, directory, prefix, frames)
+
+        _LOGGER.info("Saved %d frames from before the alarm of area %s to %s", len(paths), area_id, directory)
+        self.hass.bus.async_fire(EVENT_PRE_EVENT_SAVED, {
+            "entity_id": self.entity_id,
+            "area_id": area_id,
+            "files": paths,
+        })
+
     async def async_camera_image(self):
         """Return bytes of camera image."""
         _LOGGER.debug(
             "Handling image from camera %s",
             self.device.name
         )
+        # Someone is watching the MJPEG stream, reuse the last decoded frame
+        if self._decoder is not None and self._decoder.frame is not None:
+            return self._decoder.frame
+
+        options = self.device.config_entry.options.get(CONF_CAMERA, {})
+        max_age = options.get(CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE)
+        if self._snapshot is not None and monotonic() - self._snapshot_time < max_age:
+            return self._snapshot
+
+        # Concurrent requests share the same decode
+        if self._snapshot_task is None or self._snapshot_task.done():
+            self._snapshot_task = self.hass.async_create_task(self._async_decode_camera_image())
+
+        return await asyncio.shield(self._snapshot_task)
+
+    async def _async_decode_camera_image(self) -> Optional[bytes]:
+        """Decode a frame from the stream and cache it."""
         stream_uri = await self.stream_source()
 
-        ffmpeg = ImageFrame(self.hass.data[DATA_FFMPEG].binary, loop=self.hass.loop)
+        ffmpeg = ImageFrame(self.hass.data[DATA_FFMPEG].binary)
         image = await asyncio.shield(
             ffmpeg.get_image(
                 stream_uri,
@@ -110,6 +288,10 @@ class ParadoxCameraEntity(Camera):
             )
         )
 
+        if image and len(image) <= DEFAULT_SNAPSHOT_MAX_SIZE:
+            self._snapshot = image
+            self._snapshot_time = monotonic()
+
         return image
 
     async def handle_async_mjpeg_stream(self, request):
@@ -118,32 +300,32 @@ class ParadoxCameraEntity(Camera):
             "Handling mjpeg stream from camera %s",
             self.device.name
         )
-        stream_uri = await self.stream_source()
-        ffmpeg_manager = self.hass.data[DATA_FFMPEG]
-        
-        stream = CameraMjpeg(ffmpeg_manager.binary, loop=self.hass.loop)
-        await stream.open_camera(
-            stream_uri,
-            extra_cmd=self.device.config_entry.options.get(CONF_EXTRA_ARGUMENTS),
-        )
+        decoder = self.decoder
+        decoder.acquire()
 
         try:
-            stream_reader = await stream.get_reader()
-            return await async_aiohttp_proxy_stream(
-                self.hass,
+            return await async_get_still_stream(
                 request,
-                stream_reader,
-                ffmpeg_manager.ffmpeg_stream_content_type,
+                decoder.async_next_frame,
+                self.content_type,
+                0,
             )
         finally:
-            await stream.close()
+            await decoder.async_release()
+
+    @property
+    def is_recording(self) -> bool:
+        """Return true if the device is recording."""
+        return bool(self.device.is_recording)
 
     async def async_enable_recording(self):
         """Enable recording."""
-        return await self.device.async_rod(3)
-        # self.is_recording = True
+        result = await self.device.async_set_recording(True)
+        self.async_write_ha_state()
+        return result
 
     async def async_disable_recording(self):
         """Disable recording."""
-        return await self.device.async_rod(4)
-        # self.is_recording = False
+        result = await self.device.async_set_recording(False)
+        self.async_write_ha_state()
+        return result
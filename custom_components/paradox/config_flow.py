@@ -1,25 +1,28 @@
 """Adds config flow for Paradox integration."""
 import logging
+from time import monotonic
 import voluptuous as vol
 from typing import Any, Dict, Optional, List
 from asyncio.exceptions import TimeoutError
 from aiohttp import ClientConnectionError
-from pypdxapi.helpers import discover_modules
 from pypdxapi.exceptions import ParadoxModuleError
 from homeassistant.config_entries import (CONN_CLASS_LOCAL_POLL, ConfigEntry, ConfigFlow, OptionsFlow)
 from homeassistant.const import (CONF_NAME, CONF_HOST, CONF_PORT, CONF_TIMEOUT, CONF_USERNAME, CONF_PASSWORD,
-                                 CONF_DEVICE, CONF_DOMAIN, CONF_DOMAINS)
-from homeassistant.components.ffmpeg import CONF_EXTRA_ARGUMENTS
+                                 CONF_DEVICE, CONF_DOMAIN, CONF_DOMAINS, CONF_SCAN_INTERVAL)
 from homeassistant.core import callback
 from homeassistant.helpers.typing import (HomeAssistantType, ConfigType)
 import homeassistant.helpers.config_validation as cv
 
 from .const import (DOMAIN, CONF_MODEL, CONF_USERCODE, DEFAULT_PORT, DEFAULT_PASSWORD, DEFAULT_USERNAME,
-                    DEFAULT_USERCODE, DEFAULT_TIMEOUT,
-                    CONF_CAMERA, CAMERA_PROFILES, CONF_CAMERA_PROFILE, DEFAULT_CAMERA_PROFILE,
-                    DEFAULT_FFMPEG_ARGUMENTS,)
+                    DEFAULT_USERCODE, DEFAULT_TIMEOUT, DEFAULT_SCAN_INTERVAL, CONF_FAST_SCAN_WINDOW,
+                    DEFAULT_FAST_SCAN_WINDOW, CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL, DATA_DISCOVERY,
+                    DEFAULT_DISCOVERY_CACHE_TTL,
+                    CONF_CAMERA, CAMERA_PROFILES, CAMERA_PROFILE_AUTO, CONF_CAMERA_PROFILE, DEFAULT_CAMERA_PROFILE,
+                    CONF_EXTRA_ARGUMENTS, DEFAULT_FFMPEG_ARGUMENTS, CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE,
+                    CONF_STREAM_PROXY, DEFAULT_STREAM_PROXY, CONF_PRE_EVENT_FRAMES, DEFAULT_PRE_EVENT_FRAMES,)
 from .models import SupportedModuleInfo, DiscoveredModuleInfo
 from .device import get_device_cls
+from .discovery import async_discover_modules
 
 CONF_MANUAL_INPUT = "Manually configure Paradox module"
 
@@ -41,15 +44,20 @@ SUPPORTED_MODELS = {
 
 
 async def async_discovery(hass: HomeAssistantType) -> List[DiscoveredModuleInfo]:
-    """Return if there are devices that can be discovered."""
-    _LOGGER.debug("Starting Paradox module discovery...")
-    modules: List[dict] = await hass.async_add_executor_job(discover_modules)
+    """Return if there are devices that can be discovered.
+
+    Modules found are cached for a short time so going back and forth in the flow does not broadcast again.
+    """
+    cached = hass.data.get(DATA_DISCOVERY)
+    if cached is not None and monotonic() - cached[0] < DEFAULT_DISCOVERY_CACHE_TTL:
+        return cached[1]
 
+    _LOGGER.debug("Starting Paradox module discovery...")
     devices: List[DiscoveredModuleInfo] = []
-    for module in modules:
-        if module['type'] in list(SUPPORTED_MODELS.keys()):
+    async for module in async_discover_modules():
+        if module.get('type') in list(SUPPORTED_MODELS.keys()):
             device = DiscoveredModuleInfo(
-                name=str(module['ZoneLabel']).strip() if 'ZoneLabel' else str(module['sitename']).strip(),
+                name=str(module['ZoneLabel']).strip() if 'ZoneLabel' in module else str(module['sitename']).strip(),
                 model=module['type'],
                 serial=module['sn'],
                 host=module['ip'],
@@ -61,6 +69,10 @@ async def async_discovery(hass: HomeAssistantType) -> List[DiscoveredModuleInfo]
         else:
             _LOGGER.error("Discover a Paradox module not compatible: %s", module)
 
+    # Modules that didn't answer may just be starting, look for them again next time
+    if devices:
+        hass.data[DATA_DISCOVERY] = (monotonic(), devices)
+
     return devices
 
 
@@ -311,6 +323,11 @@ class ParadoxOptionsFlowHandler(OptionsFlow):
         options = self.config_entry.options.get(CONF_DEVICE, {})
         default_domains = options.get(CONF_DOMAINS, [])
         default_timeout = options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+        default_scan_interval = options.get(
+            CONF_SCAN_INTERVAL, self.config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        )
+        default_fast_scan_window = options.get(CONF_FAST_SCAN_WINDOW, DEFAULT_FAST_SCAN_WINDOW)
+        default_max_scan_interval = options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
         model = self.config_entry.data.get(CONF_MODEL)
         supported_domains = SUPPORTED_MODELS[model].supported_domains
 
@@ -326,6 +343,18 @@ class ParadoxOptionsFlowHandler(OptionsFlow):
                         CONF_TIMEOUT,
                         default=default_timeout,
                     ): int,
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=default_scan_interval,
+                    ): vol.All(int, vol.Range(min=1)),
+                    vol.Required(
+                        CONF_FAST_SCAN_WINDOW,
+                        default=default_fast_scan_window,
+                    ): vol.All(int, vol.Range(min=0)),
+                    vol.Required(
+                        CONF_MAX_SCAN_INTERVAL,
+                        default=default_max_scan_interval,
+                    ): vol.All(int, vol.Range(min=1)),
                 }
             ),
         )
@@ -341,6 +370,9 @@ class ParadoxOptionsFlowHandler(OptionsFlow):
         options = self.config_entry.options.get(CONF_CAMERA, {})
         default_camera_profile = options.get(CONF_CAMERA_PROFILE, DEFAULT_CAMERA_PROFILE)
         default_extra_arguments = options.get(CONF_EXTRA_ARGUMENTS, DEFAULT_FFMPEG_ARGUMENTS)
+        default_snapshot_max_age = options.get(CONF_SNAPSHOT_MAX_AGE, DEFAULT_SNAPSHOT_MAX_AGE)
+        default_stream_proxy = options.get(CONF_STREAM_PROXY, DEFAULT_STREAM_PROXY)
+        default_pre_event_frames = options.get(CONF_PRE_EVENT_FRAMES, DEFAULT_PRE_EVENT_FRAMES)
 
         return self.async_show_form(
             step_id="camera",
@@ -349,11 +381,23 @@ class ParadoxOptionsFlowHandler(OptionsFlow):
                     vol.Optional(
                         CONF_CAMERA_PROFILE,
                         default=default_camera_profile,
-                    ): vol.In(CAMERA_PROFILES),
+                    ): vol.In(CAMERA_PROFILES + [CAMERA_PROFILE_AUTO]),
                     vol.Required(
                         CONF_EXTRA_ARGUMENTS,
                         default=default_extra_arguments,
                     ): str,
+                    vol.Required(
+                        CONF_SNAPSHOT_MAX_AGE,
+                        default=default_snapshot_max_age,
+                    ): int,
+                    vol.Required(
+                        CONF_STREAM_PROXY,
+                        default=default_stream_proxy,
+                    ): bool,
+                    vol.Required(
+                        CONF_PRE_EVENT_FRAMES,
+                        default=default_pre_event_frames,
+                    ): vol.All(int, vol.Range(min=0, max=60)),
                 }
             ),
         )
@@ -1,11 +1,22 @@
 """Constants for the Paradox integration."""
 DOMAIN = 'paradox'
 MANUFACTURER = 'Paradox, Inc'
+STORAGE_VERSION = 1
 
 # Configuration
 CONF_MODEL = 'type'
 CONF_USERCODE = 'usercode'
 CONF_MODULE = 'module'
+CONF_HUB = 'hub'
+DATA_COORDINATOR = 'coordinator'
+CONF_FAST_SCAN_WINDOW = 'fast_scan_window'
+CONF_MAX_SCAN_INTERVAL = 'max_scan_interval'
+DATA_DISCOVERY = f"{DOMAIN}_discovery"
+
+# Module API: ResultCode holds the API in its high bits and the status in its low bits, 0 on success.
+# pypdxapi doesn't check the answers of the control APIs
+RESULT_STATUS_MASK = 0xFFFF
+UNCHECKED_API_CALLS = ('areacontrol', 'pgmcontrol')
 
 # Defaults
 DEFAULT_PORT = 80
@@ -13,19 +24,107 @@ DEFAULT_PASSWORD = 'paradox'
 DEFAULT_USERNAME = 'master'
 DEFAULT_USERCODE = '1234'
 DEFAULT_TIMEOUT = 10
+DEFAULT_SESSION_TIMEOUT = 120
+DEFAULT_SESSION_REFRESH = 90
+DEFAULT_KEEPALIVE_INTERVAL = 30
+DEFAULT_BREAKER_THRESHOLD = 3
+DEFAULT_BREAKER_BACKOFF = 15
+DEFAULT_BREAKER_MAX_BACKOFF = 300
+DEFAULT_BREAKER_PROBE_TIMEOUT = 3
+DEFAULT_CONNECTION_LIMIT = 2
+DEFAULT_CONNECTION_KEEPALIVE = 60
+# Video is downloaded with its own connections, so it never waits for or blocks the API calls
+DEFAULT_STREAM_CONNECTION_LIMIT = 1
+DEFAULT_CONNECT_RETRY = 60
+DEFAULT_SAVE_DELAY = 10
 DEFAULT_SCAN_INTERVAL = 30
+DEFAULT_FAST_SCAN_INTERVAL = 2
+DEFAULT_FAST_SCAN_WINDOW = 30
+DEFAULT_MAX_SCAN_INTERVAL = 120
+DEFAULT_IDLE_CYCLES = 3
+DEFAULT_SCAN_JITTER = 0.1
+DEFAULT_MAX_CONCURRENT_UPDATES = 4
+DEFAULT_COMMAND_WINDOW = 0.1
+DEFAULT_DISCOVERY_TIMEOUT = 2.5
+DEFAULT_DISCOVERY_IDLE_TIMEOUT = 1
+DEFAULT_DISCOVERY_RETRY_INTERVAL = 0.5
+DEFAULT_DISCOVERY_CACHE_TTL = 60
 
 # Alarm Panel
 CONF_ALARM_CONTROL_PANEL = 'alarm_control_panel'
+SIGNAL_ALARM_PANEL_UPDATE = 'paradox_alarm_panel_update_{}'
+SIGNAL_ALARM_TRIGGERED = 'paradox_alarm_triggered_{}'
+STATUS_AREAS = 'AreaStatus'
+STATUS_ZONES = 'ZoneStatus'
+STATUS_PGMS = 'PGMStatus'
+STATUS_ID_KEYS = {
+    STATUS_AREAS: 'AreaId',
+    STATUS_ZONES: 'ZoneId',
+    STATUS_PGMS: 'PGMId',
+}
+# Fields of the alarm panel data that are saved to create the entities at startup
+TOPOLOGY_KEYS = {
+    STATUS_AREAS: ('AreaId', 'AreaLabel'),
+    STATUS_ZONES: ('ZoneId', 'ZoneLabel'),
+    STATUS_PGMS: ('PGMId', 'PGMLabel', 'SerialNo'),
+}
+
+# Binary Sensor
+CONF_BINARY_SENSOR = 'binary_sensor'
+
+# Switch
+CONF_SWITCH = 'switch'
+PGM_COMMAND_ON = 0
+PGM_COMMAND_OFF = 1
+
+# Sensor
+CONF_SENSOR = 'sensor'
+API_METHODS = ['login', 'pingstatus', 'getstatus', 'vod', 'areacontrol', 'pgmcontrol', 'rod']
 
 # Camera
 CONF_CAMERA = 'camera'
 CONF_CAMERA_PROFILE = 'channel_type'
+# Ordered from the lowest to the highest bandwidth
 CAMERA_PROFILES = ['Low', 'Normal', 'High']
+CAMERA_PROFILE_AUTO = 'Auto'
 DEFAULT_CAMERA_PROFILE = 'Normal'
+# Adaptive profile: smoothing of the throughput, margins over the bandwidth and seconds between switches
+DEFAULT_ADAPTIVE_SMOOTHING = 0.3
+DEFAULT_ADAPTIVE_DOWN_RATIO = 1.2
+DEFAULT_ADAPTIVE_UP_RATIO = 2
+DEFAULT_ADAPTIVE_HOLD = 30
+CONF_SNAPSHOT_MAX_AGE = 'snapshot_max_age'
+DEFAULT_SNAPSHOT_MAX_AGE = 10
+DEFAULT_SNAPSHOT_MAX_SIZE = 1024 * 1024
 CAMERA_BANDWIDTH = {
     'Low': 128000,
     'Normal': 256000,
     'High': 512000
 }
+# Same key as homeassistant.components.ffmpeg, without loading ffmpeg for alarm only installs
+CONF_EXTRA_ARGUMENTS = 'extra_arguments'
 DEFAULT_FFMPEG_ARGUMENTS = '-pred 1'
+# The stream url is bound to the module session, so it is kept for the session lifetime
+DEFAULT_STREAM_SOURCE_TTL = DEFAULT_SESSION_TIMEOUT
+DEFAULT_STREAM_SOURCE_REFRESH = 30
+CONF_STREAM_PROXY = 'stream_proxy'
+DEFAULT_STREAM_PROXY = False
+DATA_STREAM_PROXY = f"{DOMAIN}_stream_proxy"
+STREAM_PROXY_URL = '/api/paradox/stream/{token}/{name}'
+STREAM_PROXY_PLAYLIST = 'playlist.m3u8'
+# Segments kept in memory for the viewers, a few target durations of the module playlist
+DEFAULT_PROXY_SEGMENTS = 6
+DEFAULT_PROXY_PLAYLIST_TTL = 1
+# Record on demand actions
+ROD_START = 3
+ROD_STOP = 4
+# Pre-event frames: number of buffered frames (0 disables the buffer) and seconds between them
+CONF_PRE_EVENT_FRAMES = 'pre_event_frames'
+DEFAULT_PRE_EVENT_FRAMES = 0
+DEFAULT_PRE_EVENT_INTERVAL = 1
+PRE_EVENT_DIRECTORY = 'paradox_events'
+# Days the saved pre-event frames are kept
+DEFAULT_PRE_EVENT_RETENTION = 7
+EVENT_PRE_EVENT_SAVED = 'paradox_pre_event_saved'
+DEFAULT_DECODER_TIMEOUT = 10
+DEFAULT_DECODER_RETRY = 1
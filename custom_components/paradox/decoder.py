@@ -0,0 +1,148 @@
+"""Shared ffmpeg decoder for Paradox cameras."""
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+from haffmpeg.camera import CameraMjpeg
+from homeassistant.core import HomeAssistant
+
+from .const import DEFAULT_DECODER_TIMEOUT, DEFAULT_DECODER_RETRY
+
+_LOGGER = logging.getLogger(__name__)
+
+JPEG_START = b'\xff\xd8'
+JPEG_END = b'\xff\xd9'
+READ_CHUNK_SIZE = 65536
+MAX_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+class ParadoxCameraDecoder:
+    """Decodes the camera stream with a single ffmpeg process and shares the frames.
+
+    MJPEG viewers acquire the decoder and wait for new frames, snapshots read the last decoded
+    frame. ffmpeg is started by the first user and stopped when the last one releases it.
+    """
+
+    def __init__(self, hass: HomeAssistant, binary: str, stream_source: Callable[[], Awaitable[str]],
+                 extra_cmd: Optional[str] = None) -> None:
+        """Initialize"""
+        self.hass: HomeAssistant = hass
+        self._binary = binary
+        self._stream_source = stream_source
+        self._extra_cmd = extra_cmd
+        self._users = 0
+        self._task: Optional[asyncio.Task] = None
+        self._frame: Optional[bytes] = None
+        self._frame_event = asyncio.Event()
+
+    @property
+    def is_running(self) -> bool:
+        """Return True if ffmpeg is decoding the stream."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def frame(self) -> Optional[bytes]:
+        """Return the last decoded frame."""
+        return self._frame if self.is_running else None
+
+    def acquire(self) -> None:
+        """Register a user and start decoding if needed."""
+        self._users += 1
+        if not self.is_running:
+            self._start()
+
+    async def async_release(self) -> None:
+        """Unregister a user and stop decoding when there are no users left."""
+        self._users = max(self._users - 1, 0)
+        if self._users == 0:
+            await self._async_cancel()
+
+            # Someone acquired the decoder while it was stopping
+            if self._users > 0 and not self.is_running:
+                self._start()
+
+    async def async_stop(self) -> None:
+        """Stop decoding for every user."""
+        self._users = 0
+        await self._async_cancel()
+
+    def _start(self) -> None:
+        """Start the decoding task.
+
+        The task runs for as long as the decoder is used, it is not tracked by Home Assistant so
+        that waiting for the pending tasks, like at startup, doesn't wait for it.
+        """
+        self._task = self.hass.loop.create_task(self._async_decode())
+
+    async def _async_cancel(self) -> None:
+        """Cancel the decoding task and wait for ffmpeg to be closed."""
+        task = self._task
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        if self._task is task:
+            self._task = None
+            self._frame = None
+
+    async def async_next_frame(self) -> Optional[bytes]:
+        """Wait for the next decoded frame.
+
+        :return: JPEG image or None if no frame was decoded in time.
+        """
+        try:
+            await asyncio.wait_for(self._frame_event.wait(), DEFAULT_DECODER_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None
+
+        return self._frame
+
+    def _set_frame(self, frame: bytes) -> None:
+        """Publish a new frame and wake up the waiting users."""
+        self._frame = frame
+        event, self._frame_event = self._frame_event, asyncio.Event()
+        event.set()
+
+    async def _async_decode(self) -> None:
+        """Run ffmpeg while there are users, restarting it if the stream ends."""
+        while self._users > 0:
+            stream = CameraMjpeg(self._binary)
+            try:
+                stream_uri = await self._stream_source()
+                if stream_uri:
+                    await stream.open_camera(stream_uri, extra_cmd=self._extra_cmd)
+                    await self._async_read_frames(await stream.get_reader())
+            finally:
+                await stream.close()
+
+            _LOGGER.debug("Camera stream ended, restarting decoder")
+            await asyncio.sleep(DEFAULT_DECODER_RETRY)
+
+    async def _async_read_frames(self, reader: asyncio.StreamReader) -> None:
+        """Split the MJPEG output of ffmpeg in JPEG frames."""
+        buffer = bytearray()
+        while True:
+            chunk = await reader.read(READ_CHUNK_SIZE)
+            if not chunk:
+                return
+
+            buffer.extend(chunk)
+            while True:
+                start = buffer.find(JPEG_START)
+                if start < 0:
+                    buffer.clear()
+                    break
+
+                end = buffer.find(JPEG_END, start + len(JPEG_START))
+                if end < 0:
+                    del buffer[:start]
+                    break
+
+                end += len(JPEG_END)
+                self._set_frame(bytes(buffer[start:end]))
+                del buffer[:end]
+
+            if len(buffer) > MAX_BUFFER_SIZE:
+                buffer.clear()
@@ -1,28 +1,45 @@
 """Paradox module abstraction."""
+import asyncio
 import logging
-from typing import List, Optional
+from datetime import datetime, timedelta
+from time import monotonic
+from dataclasses import asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from asyncio.exceptions import TimeoutError
-from aiohttp import ClientConnectionError
+from aiohttp import ClientConnectionError, ClientSession, ClientTimeout, TCPConnector
 from pypdxapi.exceptions import ParadoxModuleError
 from pypdxapi.camera import ParadoxHD77
-import m3u8
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (CONF_NAME, CONF_HOST, CONF_PORT, CONF_TIMEOUT, CONF_USERNAME, CONF_PASSWORD,
-                                 CONF_DEVICE, CONF_DOMAIN, CONF_DOMAINS)
-from homeassistant.core import HomeAssistant
+                                 CONF_DEVICE, CONF_DOMAIN, CONF_DOMAINS, EVENT_HOMEASSISTANT_CLOSE)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
 from homeassistant.helpers.update_coordinator import UpdateFailed
-
-from .const import (MANUFACTURER, CONF_MODEL, CONF_USERCODE, DEFAULT_TIMEOUT,
-                    CONF_CAMERA, CONF_CAMERA_PROFILE, DEFAULT_CAMERA_PROFILE, CAMERA_BANDWIDTH)
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from .const import (DOMAIN, MANUFACTURER, STORAGE_VERSION, DEFAULT_SAVE_DELAY, TOPOLOGY_KEYS, CONF_MODEL, CONF_USERCODE,
+                    DEFAULT_TIMEOUT, DEFAULT_SESSION_TIMEOUT, DEFAULT_SESSION_REFRESH, DEFAULT_KEEPALIVE_INTERVAL,
+                    DEFAULT_COMMAND_WINDOW, DEFAULT_BREAKER_THRESHOLD, DEFAULT_BREAKER_BACKOFF,
+                    DEFAULT_BREAKER_MAX_BACKOFF, DEFAULT_BREAKER_PROBE_TIMEOUT, DEFAULT_CONNECTION_LIMIT,
+                    DEFAULT_CONNECTION_KEEPALIVE, DEFAULT_STREAM_CONNECTION_LIMIT, SIGNAL_ALARM_PANEL_UPDATE,
+                    CONF_CAMERA, CONF_CAMERA_PROFILE, DEFAULT_CAMERA_PROFILE, CAMERA_PROFILE_AUTO, CAMERA_BANDWIDTH,
+                    DEFAULT_STREAM_SOURCE_TTL, DEFAULT_STREAM_SOURCE_REFRESH, ROD_START, ROD_STOP, RESULT_STATUS_MASK,
+                    UNCHECKED_API_CALLS, CONF_ALARM_CONTROL_PANEL, CONF_BINARY_SENSOR, CONF_SWITCH)
 from .models import DeviceInfo
+from .playlist import parse_variants, nearest_variant
+from .profile import ParadoxProfileSelector
+from .stats import ApiCallStats, RESULT_SUCCESS, RESULT_FAILURE, RESULT_TIMEOUT
 
 _LOGGER = logging.getLogger(__name__)
 
 
 def get_device_cls(hass: HomeAssistant, model: str, host: str, port: int, module_password: str,
-                   timeout: int = DEFAULT_TIMEOUT):
+                   timeout: int = DEFAULT_TIMEOUT, client_session: Optional[ClientSession] = None):
     adapter_cls = eval(f"Paradox{model}")
-    client_session = hass.helpers.aiohttp_client.async_get_clientsession()
+    if client_session is None:
+        client_session = hass.helpers.aiohttp_client.async_get_clientsession()
 
     return adapter_cls(
         host=host, port=port, module_password=module_password,
@@ -32,6 +49,102 @@ def get_device_cls(hass: HomeAssistant, model: str, host: str, port: int, module
     )
 
 
+def create_module_session(limit: int = DEFAULT_CONNECTION_LIMIT) -> ClientSession:
+    """ Create a client session dedicated to a module. Connections are kept alive between polls
+    and the number of concurrent requests is capped to what the module's web server handles.
+    """
+    connector = TCPConnector(
+        limit=limit,
+        keepalive_timeout=DEFAULT_CONNECTION_KEEPALIVE,
+        enable_cleanup_closed=True,
+    )
+
+    return ClientSession(connector=connector)
+
+
+def get_topology(alarm_panel: dict) -> dict:
+    """Return the ids and labels of the areas, zones and PGMs of the alarm panel data."""
+    return {
+        status: [
+            {key: item[key] for key in keys if key in item}
+            for item in alarm_panel[status]
+        ]
+        for status, keys in TOPOLOGY_KEYS.items()
+        if status in alarm_panel
+    }
+
+
+def check_result_code(method: str, data: Any) -> None:
+    """Raise ParadoxModuleError if the answer of a module API carries an error result code."""
+    result_code = data.get('ResultCode', -1) if isinstance(data, dict) else -1
+    if result_code & RESULT_STATUS_MASK:
+        raise ParadoxModuleError(f"Module refused the {method} call, result code {result_code}")
+
+
+class ModuleUnreachableError(ClientConnectionError):
+    """Raised without contacting the module while its circuit breaker is open."""
+
+
+class ParadoxCommandQueue:
+    """Collects commands for a short window and sends them in a single request.
+    A later command for the same target replaces the pending one.
+    """
+
+    def __init__(self, hass: HomeAssistant, send: Callable[[List[dict]], Awaitable[bool]],
+                 window: float = DEFAULT_COMMAND_WINDOW) -> None:
+        """Initialize"""
+        self.hass: HomeAssistant = hass
+        self._send = send
+        self._window = window
+        self._pending: Dict[int, dict] = {}
+        self._result: Optional[asyncio.Future] = None
+        self._unsub_send: Optional[Callable[[], None]] = None
+
+    async def async_queue(self, target: int, command: dict) -> bool:
+        """ Queue a command and wait for the result of the request that sends it.
+
+        :param target: Area, PGM, ... the command applies to.
+        :param command: Command sent to the module.
+        :return: True/False
+        """
+        self._pending[target] = command
+
+        if self._result is None:
+            self._result = self.hass.loop.create_future()
+            self._unsub_send = async_call_later(self.hass, self._window, self._async_send)
+
+        return await asyncio.shield(self._result)
+
+    async def _async_send(self, now: datetime = None) -> None:
+        """Send the queued commands. The waiting callers always get the result or the error."""
+        result = self._result
+        commands = list(self._pending.values())
+        self._result = None
+        self._pending = {}
+        self._unsub_send = None
+
+        _LOGGER.debug("Sending %s queued command(s)", len(commands))
+        try:
+            result.set_result(await self._send(commands))
+        except asyncio.CancelledError:
+            result.cancel()
+            raise
+        except Exception as error:  # pylint: disable=broad-except
+            result.set_exception(error)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the queued commands, the waiting callers get False."""
+        if self._unsub_send is not None:
+            self._unsub_send()
+            self._unsub_send = None
+
+        if self._result is not None and not self._result.done():
+            self._result.set_result(False)
+        self._result = None
+        self._pending = {}
+
+
 class ParadoxDevice:
     """Manages an Paradox device."""
     device = None
@@ -39,14 +152,39 @@ class ParadoxDevice:
     _device_info: DeviceInfo = None
     # Alarm
     _panel_info: DeviceInfo = None
+    # Session
+    _login_task: Optional[asyncio.Future] = None
+    _session_last_used: Optional[datetime] = None
+    _unsub_keepalive = None
+    _unsub_close = None
+    _client_session: Optional[ClientSession] = None
+    _stream_session: Optional[ClientSession] = None
     # Camera
     _last_stream_source = None
+    _stream_source_expires: Optional[datetime] = None
+    _stream_source_task: Optional[asyncio.Future] = None
 
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry = None):
         """Initialize"""
         self.hass: HomeAssistant = hass
         self.config_entry: ConfigEntry = config_entry
         self._options = config_entry.options.get(CONF_DEVICE, {})
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}")
+        self._cache: dict = {}
+        self.stats: Dict[str, ApiCallStats] = {}
+        self.relogins: int = 0
+        self._failures: int = 0
+        self._breaker_open_until: Optional[float] = None
+        self._breaker_backoff: float = DEFAULT_BREAKER_BACKOFF
+        self._probe_lock = asyncio.Lock()
+        self._area_commands = ParadoxCommandQueue(hass, self.async_areacontrol)
+        self._pgm_commands = ParadoxCommandQueue(hass, self.async_pgmcontrol)
+        self._stream_variants: Dict[str, str] = {}
+        self._profile_selector = ParadoxProfileSelector()
+        # Record on demand state, None until the module confirms a command
+        self.is_recording: Optional[bool] = None
+        self._recording_desired: Optional[bool] = None
+        self._recording_lock = asyncio.Lock()
 
     @property
     def model(self) -> str:
@@ -103,13 +241,25 @@ class ParadoxDevice:
         """ Return supported platforms."""
         return self.config_entry.data[CONF_DOMAIN] + self._options.get(CONF_DOMAINS, [])
 
+    @property
+    def has_alarm_panel(self) -> bool:
+        """Return True if entities of the alarm panel areas, zones or PGMs are enabled."""
+        platforms = self.platforms
+        return any(platform in platforms for platform in (CONF_ALARM_CONTROL_PANEL, CONF_BINARY_SENSOR, CONF_SWITCH))
+
     async def async_setup(self) -> bool:
         """Set up the device."""
         timeout = self._options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
 
+        if self._client_session is None:
+            self._client_session = create_module_session()
+        if self._unsub_close is None:
+            self._unsub_close = self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, self._async_close_session)
+
         try:
-            self.device = get_device_cls(self.hass, self.model, self.host, self.port, self.password, timeout=timeout)
-            data = await self.device.login(self.usercode, self.username)
+            self.device = get_device_cls(self.hass, self.model, self.host, self.port, self.password, timeout=timeout,
+                                         client_session=self._client_session)
+            data = await self.async_login()
 
             self._device_info = DeviceInfo(
                 manufacturer=MANUFACTURER,
@@ -129,6 +279,10 @@ class ParadoxDevice:
             )
 
             self._available = True
+            if self._unsub_keepalive is None:
+                self._unsub_keepalive = async_track_time_interval(
+                    self.hass, self._async_keepalive, timedelta(seconds=DEFAULT_KEEPALIVE_INTERVAL)
+                )
 
         except (ClientConnectionError, TimeoutError):
             _LOGGER.error(
@@ -149,31 +303,271 @@ class ParadoxDevice:
 
         return True
 
+    @property
+    def cached_alarm_panel(self) -> Optional[dict]:
+        """ Return the areas, zones and PGMs restored from the cache."""
+        return self._cache.get('topology')
+
+    async def async_restore(self) -> bool:
+        """ Restore the device info, panel info and topology saved by the last successful setup,
+        so entities can be created before the module is reachable.
+
+        :return: True if there was something to restore.
+        """
+        data = await self._store.async_load()
+        if not data or not data.get('device_info'):
+            return False
+
+        # The alarm panel entities are created from the panel info and topology, e.g. an entry that
+        # only had the camera before must be set up first
+        if self.has_alarm_panel and (not data.get('panel_info') or data.get('topology') is None):
+            return False
+
+        self._cache = data
+        self._device_info = DeviceInfo(**data['device_info'])
+        if data.get('panel_info'):
+            self._panel_info = DeviceInfo(**data['panel_info'])
+
+        return True
+
+    @callback
+    def async_update_cache(self, alarm_panel: Optional[dict] = None) -> None:
+        """ Save the device info, panel info and topology of the alarm panel (ids and labels of the
+        areas, zones and PGMs). Nothing is written unless something changed.
+
+        :param alarm_panel: (optional) Alarm panel data, the saved topology is kept if omitted.
+        """
+        if self._device_info is None:
+            return
+
+        topology = self._cache.get('topology')
+        if alarm_panel is not None:
+            topology = get_topology(alarm_panel)
+
+        data = {
+            'device_info': asdict(self._device_info),
+            'panel_info': asdict(self._panel_info) if self._panel_info else None,
+            'topology': topology,
+        }
+        if data == self._cache:
+            return
+
+        _LOGGER.debug("Saving topology of module '%s'", self.name)
+        self._cache = data
+        self._store.async_delay_save(lambda: data, DEFAULT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """ Remove the saved data."""
+        await self._store.async_remove()
+
+    @property
+    def connected(self) -> bool:
+        """Return True once the module was set up, entities restored at startup may exist before."""
+        return self.device is not None and self._client_session is not None
+
+    async def _async_api_call(self, method: str, *args, **kwargs) -> Any:
+        """Call a module API and record its latency and result."""
+        if not self.connected:
+            raise ClientConnectionError(f"Module '{self.name}' is not connected yet")
+
+        await self._async_check_breaker()
+
+        start = monotonic()
+        result = RESULT_FAILURE
+        try:
+            data = await getattr(self.device, method)(*args, **kwargs)
+            if method in UNCHECKED_API_CALLS:
+                check_result_code(method, data)
+            result = RESULT_SUCCESS
+            self._failures = 0
+            return data
+        except (ClientConnectionError, TimeoutError) as error:
+            if isinstance(error, TimeoutError):
+                result = RESULT_TIMEOUT
+            self._async_record_connection_failure()
+            raise
+        except ParadoxModuleError:
+            # The module answered, it is reachable
+            self._failures = 0
+            raise
+        finally:
+            self.stats.setdefault(method, ApiCallStats()).record(monotonic() - start, result)
+
+    @property
+    def breaker_open(self) -> bool:
+        """Return True while calls to the module fail fast."""
+        return self._breaker_open_until is not None
+
+    @callback
+    def _async_record_connection_failure(self) -> None:
+        """Open the circuit breaker after too many consecutive connection failures."""
+        self._failures += 1
+        if self._failures >= DEFAULT_BREAKER_THRESHOLD and self._breaker_open_until is None:
+            _LOGGER.warning(
+                "Module '%s' is unreachable, retrying in %s seconds.",
+                self.name, self._breaker_backoff
+            )
+            self._breaker_open_until = monotonic() + self._breaker_backoff
+
+    async def _async_check_breaker(self) -> None:
+        """ Fail fast while the circuit breaker is open. Once the backoff has passed, a single
+        cheap probe decides whether the breaker closes or stays open for twice as long.
+        """
+        if self._breaker_open_until is None:
+            return
+
+        async with self._probe_lock:
+            if self._breaker_open_until is None:
+                return
+
+            if monotonic() < self._breaker_open_until:
+                raise ModuleUnreachableError(f"Module '{self.name}' is unreachable")
+
+            try:
+                await asyncio.wait_for(self.device.pingstatus(), DEFAULT_BREAKER_PROBE_TIMEOUT)
+            except (ClientConnectionError, TimeoutError) as error:
+                self._breaker_backoff = min(self._breaker_backoff * 2, DEFAULT_BREAKER_MAX_BACKOFF)
+                self._breaker_open_until = monotonic() + self._breaker_backoff
+                _LOGGER.debug(
+                    "Module '%s' is still unreachable, retrying in %s seconds.",
+                    self.name, self._breaker_backoff
+                )
+                raise ModuleUnreachableError(f"Module '{self.name}' is unreachable") from error
+            except ParadoxModuleError:
+                pass
+
+            _LOGGER.info("Module '%s' is reachable again.", self.name)
+            self._failures = 0
+            self._breaker_open_until = None
+            self._breaker_backoff = DEFAULT_BREAKER_BACKOFF
+
+    async def async_unload(self) -> None:
+        """Stop the background tasks of the device and close its connections."""
+        if self._login_task is not None and not self._login_task.done():
+            self._login_task.cancel()
+        self._login_task = None
+
+        self._area_commands.async_cancel()
+        self._pgm_commands.async_cancel()
+
+        if self._unsub_keepalive is not None:
+            self._unsub_keepalive()
+            self._unsub_keepalive = None
+
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+
+        await self._async_close_session()
+
+    async def _async_close_session(self, event=None) -> None:
+        """Close the client session of the module."""
+        if self._client_session is not None:
+            await self._client_session.close()
+            self._client_session = None
+
+        if self._stream_session is not None:
+            await self._stream_session.close()
+            self._stream_session = None
+
+    @property
+    def session_valid(self) -> bool:
+        """ Return True if the session key is valid and is not about to expire."""
+        if self.device is None or self.device.session_key is None or self._session_last_used is None:
+            return False
+
+        return dt_util.utcnow() - self._session_last_used < timedelta(seconds=DEFAULT_SESSION_TIMEOUT)
+
+    async def async_login(self) -> dict:
+        """ Log the user into the module. Concurrent callers share the same login request.
+
+        :return: dict data from module
+        """
+        if self._login_task is None or self._login_task.done():
+            self._login_task = self.hass.async_create_task(self._async_login())
+
+        return await asyncio.shield(self._login_task)
+
+    async def _async_login(self) -> dict:
+        """Log in and reset the session state."""
+        _LOGGER.debug("Logging in to module '%s'", self.name)
+        if self._session_last_used is not None:
+            self.relogins += 1
+
+        data = await self._async_api_call('login', usercode=self.usercode, username=self.username)
+        self._session_last_used = dt_util.utcnow()
+
+        # The stream url belongs to the previous session, negotiate a new one ahead of time
+        self._last_stream_source = None
+        self._stream_variants = {}
+        if CONF_CAMERA in self.platforms:
+            self.hass.async_create_task(self._async_prefetch_stream_source())
+
+        return data
+
+    async def async_ensure_session(self) -> None:
+        """Make sure there is a valid session before calling an authenticated API.
+        The keepalive keeps the session fresh, so this only logs in after a failure.
+        """
+        if not self.session_valid:
+            await self.async_login()
+
+    async def _async_session_call(self, method: str, *args, **kwargs) -> Any:
+        """ Call an authenticated module API. The session is only tracked locally, so when the module
+        rejects it (e.g. after a reboot) the session is renewed and the call retried once.
+        """
+        await self.async_ensure_session()
+        try:
+            data = await self._async_api_call(method, *args, **kwargs)
+        except ParadoxModuleError:
+            _LOGGER.debug("Module '%s' rejected the %s call, logging in again", self.name, method)
+            await self.async_login()
+            data = await self._async_api_call(method, *args, **kwargs)
+
+        # Only calls that carry the session key keep it alive
+        self._session_last_used = dt_util.utcnow()
+        self._available = True
+        return data
+
+    async def _async_keepalive(self, now: datetime = None) -> None:
+        """Refresh the session in the background before it expires."""
+        if self._session_last_used is not None and \
+                dt_util.utcnow() - self._session_last_used < timedelta(seconds=DEFAULT_SESSION_REFRESH):
+            return
+
+        try:
+            if self.session_valid:
+                await self._async_api_call('getstatus', status_type=1, keep_alive=True)
+                self._session_last_used = dt_util.utcnow()
+                return
+        except ParadoxModuleError:
+            _LOGGER.debug("Session of module '%s' expired, logging in again", self.name)
+        except (ClientConnectionError, TimeoutError):
+            _LOGGER.debug("Couldn't refresh the session of module '%s'", self.name)
+            return
+
+        try:
+            await self.async_login()
+            self._available = self._device_info is not None
+        except (ClientConnectionError, TimeoutError, ParadoxModuleError):
+            _LOGGER.debug("Couldn't log in to module '%s', will retry later", self.name)
+
     async def async_stream_source(self) -> Optional[str]:
         """ Calls video on demand and obtains the stream url according to the quality channel.
         API returns m3u8 playlist file and Home Assistant is not adaptive and always get the
-        first segment (low quality). Then I use a parse to get the selected channel.
+        first segment (low quality). Then I use a parse to get the variant closest to the selected channel.
+
+        The url is cached for DEFAULT_STREAM_SOURCE_TTL and renewed in the background when it is
+        about to expire, so only a cold cache waits on the module.
 
         :return: (str) Url
         """
         try:
-            if not self.device.is_authenticated():
-                self._last_stream_source = None
-                await self.device.login(username=self.username, usercode=self.usercode)
-
-            if self._last_stream_source is None:
-                options = self.config_entry.options.get(CONF_CAMERA, {})
-                channel_type = options.get(CONF_CAMERA_PROFILE, DEFAULT_CAMERA_PROFILE)
-                bandwidth = CAMERA_BANDWIDTH[channel_type]
-                _LOGGER.debug("Channel type: %s", bandwidth)
-
-                m3u8_file = await self.device.vod(channel_type=channel_type.lower())
-                variant_m3u8 = m3u8.loads(m3u8_file)
-
-                for playlist in variant_m3u8.playlists:
-                    if playlist.stream_info.bandwidth == bandwidth:
-                        self._last_stream_source = playlist.uri
-                        break
+            now = dt_util.utcnow()
+            if self._last_stream_source is None or now >= self._stream_source_expires:
+                await self._async_update_stream_source()
+            elif now >= self._stream_source_expires - timedelta(seconds=DEFAULT_STREAM_SOURCE_REFRESH):
+                self.hass.async_create_task(self._async_prefetch_stream_source())
 
             return self._last_stream_source
 
@@ -197,13 +591,111 @@ class ParadoxDevice:
 
         return ''
 
+    async def _async_update_stream_source(self) -> None:
+        """Negotiate a new stream url. Concurrent callers share the same request."""
+        if self._stream_source_task is None or self._stream_source_task.done():
+            self._stream_source_task = self.hass.async_create_task(self._async_fetch_stream_source())
+
+        await asyncio.shield(self._stream_source_task)
+
+    async def _async_prefetch_stream_source(self) -> None:
+        """Negotiate a new stream url in the background."""
+        try:
+            await self._async_update_stream_source()
+        except (ClientConnectionError, TimeoutError, ParadoxModuleError):
+            _LOGGER.debug("Couldn't prefetch stream url from camera '%s'", self.name)
+
+    @property
+    def adaptive_stream(self) -> bool:
+        """Return True if the camera profile follows the measured throughput."""
+        options = self.config_entry.options.get(CONF_CAMERA, {})
+        return options.get(CONF_CAMERA_PROFILE, DEFAULT_CAMERA_PROFILE) == CAMERA_PROFILE_AUTO
+
+    @property
+    def camera_profile(self) -> str:
+        """Return the camera profile in use."""
+        if self.adaptive_stream:
+            return self._profile_selector.profile
+
+        options = self.config_entry.options.get(CONF_CAMERA, {})
+        return options.get(CONF_CAMERA_PROFILE, DEFAULT_CAMERA_PROFILE)
+
+    @property
+    def stream_throughput(self) -> Optional[float]:
+        """Return the measured stream throughput in bits per second."""
+        return self._profile_selector.throughput
+
+    async def _async_fetch_stream_source(self) -> None:
+        """Call video on demand and pick the url of the configured quality channel."""
+        await self.async_ensure_session()
+
+        channel_type = self.camera_profile
+        bandwidth = CAMERA_BANDWIDTH[channel_type]
+        _LOGGER.debug("Channel type: %s", bandwidth)
+
+        # The variant table belongs to the session and is cleared on login
+        if channel_type not in self._stream_variants:
+            m3u8_file = await self._async_session_call('vod', channel_type=channel_type.lower())
+
+            variants = parse_variants(m3u8_file)
+            self._stream_variants = {}
+            for profile, profile_bandwidth in CAMERA_BANDWIDTH.items():
+                variant = nearest_variant(variants, profile_bandwidth)
+                if variant is not None:
+                    self._stream_variants[profile] = variant.uri
+
+        if channel_type not in self._stream_variants:
+            _LOGGER.warning("Camera '%s' returned a playlist without variant streams", self.name)
+            return
+
+        self._last_stream_source = self._stream_variants[channel_type]
+        self._stream_source_expires = dt_util.utcnow() + timedelta(seconds=DEFAULT_STREAM_SOURCE_TTL)
+
+    @callback
+    def async_record_stream_download(self, size: int, elapsed: float) -> None:
+        """Record the download of a stream segment and switch the adaptive profile if needed."""
+        if not self.adaptive_stream or not self._profile_selector.record(size, elapsed):
+            return
+
+        profile = self._profile_selector.profile
+        if profile in self._stream_variants:
+            _LOGGER.info("Camera '%s' switched to the %s profile", self.name, profile)
+            self._last_stream_source = self._stream_variants[profile]
+
+    async def async_get_stream_data(self, url: str, record_download: bool = False) -> bytes:
+        """ Download a playlist or segment of the camera stream with the stream client session of the module.
+
+        :param url: Url of the playlist or segment.
+        :param record_download: Feed the adaptive profile with the transfer time of the body, which leaves
+            out waiting for a connection and the response latency.
+        :return: bytes
+        """
+        if not self.connected:
+            raise ClientConnectionError(f"Module '{self.name}' is not connected yet")
+
+        timeout = ClientTimeout(total=self._options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT))
+        if self._stream_session is None:
+            self._stream_session = create_module_session(DEFAULT_STREAM_CONNECTION_LIMIT)
+
+        async with self._stream_session.get(url, timeout=timeout, raise_for_status=True) as response:
+            start = monotonic()
+            data = await response.read()
+
+        if record_download:
+            self.async_record_stream_download(len(data), monotonic() - start)
+
+        return data
+
     async def async_update_alarm_panel(self) -> dict:
         """ Fetch alarm panel data
 
         :return: dict data from module
         """
         try:
-            return await self.device.pingstatus()
+            # pingstatus doesn't need a session
+            data = await self._async_api_call('pingstatus')
+            self._available = True
+            return data
 
         except (ClientConnectionError, TimeoutError) as error:
             _LOGGER.error(
@@ -225,6 +717,56 @@ class ParadoxDevice:
             )
             raise UpdateFailed(error) from error
 
+    async def async_push_alarm_panel(self) -> None:
+        """ Fetch alarm panel data out of the polling cycle and push it to the subscribers.
+        The module has no event endpoint, so this is called whenever we know the panel state
+        has just changed (e.g. after a command) instead of waiting for the next poll.
+        """
+        try:
+            data = await self.async_update_alarm_panel()
+        except UpdateFailed:
+            return
+
+        async_dispatcher_send(self.hass, SIGNAL_ALARM_PANEL_UPDATE.format(self.config_entry.unique_id), data)
+
+    async def async_queue_area_command(self, area_id: int, command: int, force_zones: bool = False) -> bool:
+        """ Queue an area command. Commands queued within a short window are sent to the module in a
+        single areacontrol request, and a later command for an area replaces the pending one.
+
+        :param area_id: AreaID
+        :param command: AreaCommand
+        :param force_zones: ForceZones
+        :return: True/False
+        """
+        if not self.connected:
+            _LOGGER.error("Couldn't send command to alarm panel from module '%s', not connected yet.", self.name)
+            return False
+
+        return await self._area_commands.async_queue(area_id, {
+            "AreaID": area_id,
+            "AreaCommand": command,
+            "ForceZones": force_zones,
+        })
+
+    async def async_queue_pgm_command(self, pgm_id: int, command: int, serial: str = '') -> bool:
+        """ Queue a PGM command. Commands queued within a short window are sent to the module in a
+        single pgmcontrol request, and a later command for a PGM replaces the pending one.
+
+        :param pgm_id: PGMID
+        :param command: PGMCommand
+        :param serial: SerialNo
+        :return: True/False
+        """
+        if not self.connected:
+            _LOGGER.error("Couldn't send command to PGM from module '%s', not connected yet.", self.name)
+            return False
+
+        return await self._pgm_commands.async_queue(pgm_id, {
+            "PGMID": pgm_id,
+            "SerialNo": serial,
+            "PGMCommand": command,
+        })
+
     async def async_areacontrol(self, area_commands: List[dict]) -> bool:
         """ Control Areas
 
@@ -232,10 +774,8 @@ class ParadoxDevice:
         :return: True/False
         """
         try:
-            if not self.device.is_authenticated():
-                await self.device.login(username=self.username, usercode=self.usercode)
-
-            await self.device.areacontrol(area_commands)
+            await self._async_session_call('areacontrol', area_commands)
+            self.hass.async_create_task(self.async_push_alarm_panel())
             return True
 
         except (ClientConnectionError, TimeoutError):
@@ -258,17 +798,59 @@ class ParadoxDevice:
 
         return False
 
+    async def async_pgmcontrol(self, pgm_commands: List[dict]) -> bool:
+        """ Control PGMs
+
+        :param pgm_commands: PGMID
+        :return: True/False
+        """
+        try:
+            await self._async_session_call('pgmcontrol', pgm_commands)
+            self.hass.async_create_task(self.async_push_alarm_panel())
+            return True
+
+        except (ClientConnectionError, TimeoutError):
+            _LOGGER.exception(
+                "Couldn't send command to PGM from module '%s'.",
+                self.name
+            )
+        except ParadoxModuleError:
+            _LOGGER.error(
+                "Couldn't send command to PGM from module '%s', the module refused the command.",
+                self.name
+            )
+        except NotImplementedError:
+            _LOGGER.exception(
+                "Couldn't send command to PGM from module '%s'. Unexpected exception.",
+                self.name
+            )
+
+        return False
+
+    async def async_set_recording(self, recording: bool) -> bool:
+        """ Start/Stop record on demand only if the module is not already in that state.
+        Toggles made while a command is in flight are merged, the last requested state wins.
+
+        :param recording: True to start recording
+        :return: bool True if the module is in the requested state
+        """
+        self._recording_desired = recording
+        async with self._recording_lock:
+            desired = self._recording_desired
+            if desired != self.is_recording:
+                if await self.async_rod(ROD_START if desired else ROD_STOP):
+                    self.is_recording = desired
+
+        return self.is_recording == recording
+
     async def async_rod(self, state: int) -> bool:
         """ Start/Stop record on demand
 
-        :param state: 3 -> Start, 4 -> Stop
+        :param state: ROD_START (3) -> Start, ROD_STOP (4) -> Stop
         :return: bool
         """
         try:
-            if not self.device.is_authenticated():
-                await self.device.login(username=self.username, usercode=self.usercode)
-
-            data = await self.device.rod(action=state)
+            data = await self._async_session_call('rod', action=state)
             return data['ResultCode'] == 33816578
 
         except (ClientConnectionError, TimeoutError):
@@ -0,0 +1,55 @@
+"""Diagnostics support for Paradox.
+
+Home Assistant versions with the diagnostics integration load this platform, the others ignore it.
+"""
+from dataclasses import asdict
+from typing import Any, Dict, cast
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD
+from homeassistant.helpers.typing import HomeAssistantType
+
+from .const import DOMAIN, CONF_MODULE, CONF_HUB, CONF_USERCODE, DATA_COORDINATOR
+from .device import ParadoxDevice
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERCODE}
+REDACTED = '**REDACTED**'
+
+
+def redact_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the data without the credentials."""
+    return {
+        key: REDACTED if key in TO_REDACT else value
+        for key, value in data.items()
+    }
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistantType, entry: ConfigEntry) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.unique_id]
+    module = cast(ParadoxDevice, data[CONF_MODULE])
+
+    diagnostics = {
+        "entry": redact_data(dict(entry.data)),
+        "options": dict(entry.options),
+        "available": module.available,
+        "breaker_open": module.breaker_open,
+        "device_info": asdict(module.device_info) if module.device_info else None,
+        "panel_info": asdict(module.panel_info) if module.panel_info else None,
+        "relogins": module.relogins,
+        "recording": module.is_recording,
+        "hub": hass.data[DOMAIN][CONF_HUB].health,
+        "api": {
+            method: stats.as_dict()
+            for method, stats in module.stats.items()
+        },
+    }
+
+    coordinator = data.get(DATA_COORDINATOR)
+    if coordinator is not None:
+        diagnostics[DATA_COORDINATOR] = {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "data": coordinator.data,
+        }
+
+    return diagnostics
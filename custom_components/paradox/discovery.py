@@ -0,0 +1,99 @@
+"""Asyncio implementation of Paradox module discovery."""
+import asyncio
+import logging
+import socket
+from typing import AsyncIterator, Tuple
+from urllib.parse import parse_qsl
+
+from .const import (DEFAULT_DISCOVERY_TIMEOUT, DEFAULT_DISCOVERY_IDLE_TIMEOUT,
+                    DEFAULT_DISCOVERY_RETRY_INTERVAL)
+
+_LOGGER = logging.getLogger(__name__)
+
+DISCOVERY_PORT = 10000
+DISCOVERY_REQUEST = b'paradoxip?'
+DISCOVERY_RESPONSE = 'paradoxip!'
+
+
+class ParadoxDiscoveryProtocol(asyncio.DatagramProtocol):
+    """Collect the answers of Paradox modules to a discovery broadcast."""
+
+    def __init__(self, queue: asyncio.Queue) -> None:
+        """Initialize"""
+        self._queue = queue
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        """Handle a discovery answer."""
+        response = data.decode(errors='ignore')
+        if response.startswith(DISCOVERY_RESPONSE):
+            _LOGGER.debug("Found Paradox module on %s: %s", addr, response)
+            self._queue.put_nowait(dict(parse_qsl(response[len(DISCOVERY_RESPONSE):])))
+
+    def error_received(self, exc: Exception) -> None:
+        """Handle a socket error."""
+        _LOGGER.debug("Discovery error: %s", exc)
+
+
+async def async_discover_modules(
+        timeout: float = DEFAULT_DISCOVERY_TIMEOUT,
+        idle_timeout: float = DEFAULT_DISCOVERY_IDLE_TIMEOUT,
+        host: str = '<broadcast>',
+        port: int = DISCOVERY_PORT) -> AsyncIterator[dict]:
+    """ Discover Paradox modules on the network, yielding each module as soon as it answers.
+
+    The announcement is repeated until the timeout, but the discovery stops early when modules
+    have answered and no new one showed up for idle_timeout seconds.
+
+    :param timeout: (optional) Maximum discovery time in seconds.
+    :param idle_timeout: (optional) Time to wait for more modules after the last answer.
+    :param host: (optional) Address to send the announcement to.
+    :param port: (optional) Discovery UDP port.
+    :return: Discovered modules.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    try:
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: ParadoxDiscoveryProtocol(queue),
+            local_addr=('0.0.0.0', port),
+            allow_broadcast=True,
+            reuse_port=hasattr(socket, 'SO_REUSEPORT'),
+        )
+    except OSError:
+        _LOGGER.exception("Discovery error.")
+        return
+
+    seen = set()
+    try:
+        deadline = loop.time() + timeout
+        idle_deadline = deadline
+        next_announcement = loop.time()
+
+        while True:
+            now = loop.time()
+            if now >= min(deadline, idle_deadline):
+                break
+
+            if now >= next_announcement:
+                transport.sendto(DISCOVERY_REQUEST, (host, port))
+                _LOGGER.debug("Paradox discovery announcement sent")
+                next_announcement = now + DEFAULT_DISCOVERY_RETRY_INTERVAL
+
+            try:
+                module = await asyncio.wait_for(
+                    queue.get(),
+                    min(deadline, idle_deadline, next_announcement) - now
+                )
+            except asyncio.TimeoutError:
+                continue
+
+            key = module.get('sn') or tuple(sorted(module.items()))
+            if key in seen:
+                continue
+
+            seen.add(key)
+            idle_deadline = loop.time() + idle_timeout
+            yield module
+    finally:
+        transport.close()
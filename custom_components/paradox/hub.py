@@ -0,0 +1,59 @@
+"""Paradox hub shared by every module of the installation."""
+import asyncio
+import logging
+import random
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .const import DEFAULT_MAX_CONCURRENT_UPDATES, DEFAULT_SCAN_JITTER
+from .device import ParadoxDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ParadoxHub:
+    """Coordinates the polling of all the Paradox modules.
+
+    Updates of every module go through a global concurrency limit, and the polling intervals are
+    jittered so modules set up together don't keep polling in bursts.
+    """
+
+    def __init__(self, max_concurrent_updates: int = DEFAULT_MAX_CONCURRENT_UPDATES,
+                 jitter: float = DEFAULT_SCAN_JITTER) -> None:
+        """Initialize"""
+        self._semaphore = asyncio.Semaphore(max_concurrent_updates)
+        self._jitter = jitter
+        self._modules: Dict[str, ParadoxDevice] = {}
+        self._coordinators: Dict[str, Any] = {}
+
+    def register(self, unique_id: str, module: ParadoxDevice, coordinator: Optional[Any] = None) -> None:
+        """Register a module and its coordinator."""
+        self._modules[unique_id] = module
+        if coordinator is not None:
+            self._coordinators[unique_id] = coordinator
+
+    def unregister(self, unique_id: str) -> None:
+        """Unregister a module."""
+        self._modules.pop(unique_id, None)
+        self._coordinators.pop(unique_id, None)
+
+    def jitter(self, interval: timedelta) -> timedelta:
+        """Return the interval spread randomly by the configured jitter."""
+        return interval * random.uniform(1 - self._jitter, 1 + self._jitter)
+
+    async def async_update(self, update: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a module update within the global concurrency limit."""
+        async with self._semaphore:
+            return await update()
+
+    @property
+    def health(self) -> dict:
+        """Return the aggregated health of the modules."""
+        return {
+            "modules": len(self._modules),
+            "available": sum(1 for module in self._modules.values() if module.available),
+            "updating": len(self._coordinators),
+            "update_failed": sum(
+                1 for coordinator in self._coordinators.values() if not coordinator.last_update_success
+            ),
+        }
@@ -30,3 +30,10 @@ class DeviceInfo:
     sw_version: str
     serial: str
     mac: Optional[str] = None
+
+
+@dataclass
+class StreamVariant:
+    """Represent a variant stream of a camera playlist."""
+    uri: str
+    bandwidth: int
@@ -0,0 +1,37 @@
+"""Parser of the HLS playlists of the Paradox cameras."""
+import re
+from typing import List, Optional
+
+from .models import StreamVariant
+
+STREAM_INF = '#EXT-X-STREAM-INF:'
+# Attribute values may be quoted strings with commas, like CODECS
+ATTRIBUTE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^",]*)')
+
+
+def parse_variants(playlist: str) -> List[StreamVariant]:
+    """Return the variant streams of a master playlist.
+
+    Only the bandwidth and uri of the variants are needed, so this reads the EXT-X-STREAM-INF tags in a
+    single pass instead of building the whole playlist model.
+    """
+    variants = []
+    bandwidth = None
+    for line in playlist.splitlines():
+        line = line.strip()
+        if line.startswith(STREAM_INF):
+            attributes = dict(ATTRIBUTE.findall(line[len(STREAM_INF):]))
+            bandwidth = int(attributes.get('BANDWIDTH') or 0)
+        elif line and not line.startswith('#') and bandwidth is not None:
+            variants.append(StreamVariant(uri=line, bandwidth=bandwidth))
+            bandwidth = None
+
+    return variants
+
+
+def nearest_variant(variants: List[StreamVariant], bandwidth: int) -> Optional[StreamVariant]:
+    """Return the variant with the bandwidth closest to the wanted one, preferring the lower."""
+    if not variants:
+        return None
+
+    return min(variants, key=lambda variant: (abs(variant.bandwidth - bandwidth), variant.bandwidth))
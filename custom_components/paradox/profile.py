@@ -0,0 +1,53 @@
+"""Adaptive selection of the Paradox camera profile."""
+import logging
+from time import monotonic
+from typing import Optional
+
+from .const import (CAMERA_PROFILES, CAMERA_BANDWIDTH, DEFAULT_CAMERA_PROFILE, DEFAULT_ADAPTIVE_SMOOTHING,
+                    DEFAULT_ADAPTIVE_DOWN_RATIO, DEFAULT_ADAPTIVE_UP_RATIO, DEFAULT_ADAPTIVE_HOLD)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ParadoxProfileSelector:
+    """Picks the camera profile the link can keep up with from the segment download throughput.
+
+    The throughput is smoothed, and the thresholds to step down and up are apart and followed by a
+    hold time, so the profile doesn't flap when the throughput sits around a bandwidth.
+    """
+
+    def __init__(self, profile: str = DEFAULT_CAMERA_PROFILE) -> None:
+        """Initialize"""
+        self.profile = profile
+        self.throughput: Optional[float] = None
+        self._last_switch: float = monotonic()
+
+    def record(self, size: int, elapsed: float) -> bool:
+        """Record the download of a segment. Return True if the profile changed."""
+        if size <= 0 or elapsed <= 0:
+            return False
+
+        sample = size * 8 / elapsed
+        if self.throughput is None:
+            self.throughput = sample
+        else:
+            self.throughput += DEFAULT_ADAPTIVE_SMOOTHING * (sample - self.throughput)
+
+        if monotonic() - self._last_switch < DEFAULT_ADAPTIVE_HOLD:
+            return False
+
+        index = CAMERA_PROFILES.index(self.profile)
+        if index > 0 and self.throughput < CAMERA_BANDWIDTH[self.profile] * DEFAULT_ADAPTIVE_DOWN_RATIO:
+            profile = CAMERA_PROFILES[index - 1]
+        elif (index < len(CAMERA_PROFILES) - 1
+              and self.throughput > CAMERA_BANDWIDTH[CAMERA_PROFILES[index + 1]] * DEFAULT_ADAPTIVE_UP_RATIO):
+            profile = CAMERA_PROFILES[index + 1]
+        else:
+            return False
+
+        _LOGGER.debug("Switching camera profile from %s to %s, throughput %d bps",
+                      self.profile, profile, self.throughput)
+        self.profile = profile
+        self._last_switch = monotonic()
+
+        return True
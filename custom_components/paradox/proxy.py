@@ -0,0 +1,226 @@
+"""HLS proxy of the Paradox camera stream."""
+import asyncio
+import logging
+import secrets
+from collections import OrderedDict
+from time import monotonic
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+from asyncio.exceptions import TimeoutError
+from aiohttp import ClientError, web
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.network import NoURLAvailableError, get_url
+
+from .const import (DATA_STREAM_PROXY, STREAM_PROXY_URL, STREAM_PROXY_PLAYLIST, DEFAULT_PROXY_SEGMENTS,
+                    DEFAULT_PROXY_PLAYLIST_TTL)
+from .device import ParadoxDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE_PLAYLIST = 'application/vnd.apple.mpegurl'
+CONTENT_TYPE_SEGMENT = 'video/mp2t'
+
+MEDIA_SEQUENCE = '#EXT-X-MEDIA-SEQUENCE:'
+DISCONTINUITY_SEQUENCE = '#EXT-X-DISCONTINUITY-SEQUENCE:'
+DISCONTINUITY = '#EXT-X-DISCONTINUITY'
+SEGMENT_INFO = '#EXTINF:'
+
+
+def async_get_proxies(hass: HomeAssistant) -> Dict[str, 'ParadoxStreamProxy']:
+    """Return the stream proxies, registering the view on first use."""
+    if DATA_STREAM_PROXY not in hass.data:
+        hass.data[DATA_STREAM_PROXY] = {}
+        hass.http.register_view(ParadoxStreamProxyView(hass.data[DATA_STREAM_PROXY]))
+
+    return hass.data[DATA_STREAM_PROXY]
+
+
+class ParadoxStreamProxy:
+    """Serves the camera stream to every consumer from a single download of each segment.
+
+    The module playlist is rewritten to point to the proxy, and the last segments are kept in a
+    bounded ring buffer. The module only sees one client however many streams are open.
+    """
+
+    def __init__(self, hass: HomeAssistant, device: ParadoxDevice,
+                 max_segments: int = DEFAULT_PROXY_SEGMENTS) -> None:
+        """Initialize"""
+        self.hass: HomeAssistant = hass
+        self.device = device
+        self.token = secrets.token_hex(16)
+        self._max_segments = max_segments
+        self._playlist: Optional[bytes] = None
+        self._playlist_time: float = 0
+        self._playlist_task: Optional[asyncio.Future] = None
+        # Segment name of the proxy for each module url, and their contents
+        self._names: Dict[str, str] = OrderedDict()
+        self._urls: Dict[str, str] = OrderedDict()
+        self._segments: Dict[str, bytes] = OrderedDict()
+        self._segment_tasks: Dict[str, asyncio.Future] = {}
+        self._sequence = 0
+        # Switching the variant starts other segments, the first one is marked as a discontinuity
+        self._source: Optional[str] = None
+        self._discontinuities: List[int] = []
+        self._discontinuity_sequence = 0
+
+    @property
+    def url(self) -> Optional[str]:
+        """Return the url of the proxied playlist, None if Home Assistant has no internal url."""
+        path = STREAM_PROXY_URL.format(token=self.token, name=STREAM_PROXY_PLAYLIST)
+        try:
+            return f"{get_url(self.hass, allow_external=False)}{path}"
+        except NoURLAvailableError:
+            return None
+
+    def clear(self) -> None:
+        """Cancel the downloads and drop the buffered playlist and segments."""
+        if self._playlist_task is not None and not self._playlist_task.done():
+            self._playlist_task.cancel()
+        self._playlist_task = None
+        for task in self._segment_tasks.values():
+            task.cancel()
+        self._segment_tasks.clear()
+
+        self._playlist = None
+        self._source = None
+        self._discontinuities.clear()
+        self._names.clear()
+        self._urls.clear()
+        self._segments.clear()
+
+    async def async_playlist(self) -> bytes:
+        """Return the rewritten playlist. Concurrent consumers share the same download."""
+        if self._playlist is not None and monotonic() - self._playlist_time < DEFAULT_PROXY_PLAYLIST_TTL:
+            return self._playlist
+
+        if self._playlist_task is None or self._playlist_task.done():
+            self._playlist_task = self.hass.async_create_task(self._async_fetch_playlist())
+
+        return await asyncio.shield(self._playlist_task)
+
+    async def _async_fetch_playlist(self) -> bytes:
+        """Download the module playlist and point its segments to the proxy."""
+        source = await self.device.async_stream_source()
+        if not source:
+            raise web.HTTPServiceUnavailable()
+
+        playlist = (await self.device.async_get_stream_data(source)).decode()
+        self._playlist = self.rewrite_playlist(source, playlist)
+        self._playlist_time = monotonic()
+
+        return self._playlist
+
+    def rewrite_playlist(self, source: str, playlist: str) -> bytes:
+        """ Point the segments of a module playlist to the proxy.
+
+        Segments are numbered by the proxy, so the media sequence keeps increasing when the module
+        url or variant changes, and a discontinuity is inserted before the first segment of the new one.
+        """
+        lines: List[str] = []
+        sequences: List[int] = []
+        segment_start = None
+        for line in playlist.splitlines():
+            line = line.strip()
+            if line.startswith((MEDIA_SEQUENCE, DISCONTINUITY_SEQUENCE)):
+                continue
+
+            if line.startswith(SEGMENT_INFO) and segment_start is None:
+                segment_start = len(lines)
+            elif line and not line.startswith('#'):
+                sequence = self._segment_sequence(urljoin(source, line))
+                if not sequences and self._source is not None and source != self._source:
+                    self._discontinuities.append(sequence)
+                if sequence in self._discontinuities:
+                    lines.insert(len(lines) if segment_start is None else segment_start, DISCONTINUITY)
+                sequences.append(sequence)
+                segment_start = None
+                line = f"{sequence}.ts"
+
+            lines.append(line)
+
+        self._source = source
+        if sequences:
+            # Discontinuities that left the playlist are counted in the discontinuity sequence
+            while self._discontinuities and self._discontinuities[0] < sequences[0]:
+                self._discontinuities.pop(0)
+                self._discontinuity_sequence += 1
+
+            header = [f"{MEDIA_SEQUENCE}{sequences[0]}"]
+            if self._discontinuity_sequence:
+                header.append(f"{DISCONTINUITY_SEQUENCE}{self._discontinuity_sequence}")
+            # After #EXTM3U
+            lines[1:1] = header
+
+        return ('\n'.join(lines) + '\n').encode()
+
+    def _segment_sequence(self, url: str) -> int:
+        """Return the proxy sequence number of a segment of the module, keeping only the recent ones."""
+        if url not in self._names:
+            self._sequence += 1
+            name = f"{self._sequence}.ts"
+            self._names[url] = name
+            self._urls[name] = url
+            # Module playlists list a few segments, keep the names of a few playlists
+            while len(self._names) > self._max_segments * 2:
+                _, old_name = self._names.popitem(last=False)
+                self._urls.pop(old_name, None)
+
+        return int(self._names[url][:-len('.ts')])
+
+    async def async_segment(self, name: str) -> bytes:
+        """Return a segment, downloading it from the module only once."""
+        if name in self._segments:
+            return self._segments[name]
+
+        if name not in self._urls:
+            raise web.HTTPNotFound()
+
+        if name not in self._segment_tasks:
+            self._segment_tasks[name] = self.hass.async_create_task(self._async_fetch_segment(name))
+
+        return await asyncio.shield(self._segment_tasks[name])
+
+    async def _async_fetch_segment(self, name: str) -> bytes:
+        """Download a segment and put it in the ring buffer."""
+        try:
+            data = await self.device.async_get_stream_data(self._urls[name], record_download=True)
+        finally:
+            self._segment_tasks.pop(name, None)
+
+        self._segments[name] = data
+        while len(self._segments) > self._max_segments:
+            self._segments.popitem(last=False)
+
+        return data
+
+
+class ParadoxStreamProxyView(HomeAssistantView):
+    """Serve the camera streams proxied by the integration.
+
+    Like the camera proxy of Home Assistant, the url carries a random token instead of requiring
+    authentication, so the stream worker and ffmpeg can open it.
+    """
+
+    url = STREAM_PROXY_URL
+    name = 'api:paradox:stream'
+    requires_auth = False
+
+    def __init__(self, proxies: Dict[str, ParadoxStreamProxy]) -> None:
+        """Initialize"""
+        self._proxies = proxies
+
+    async def get(self, request: web.Request, token: str, name: str) -> web.Response:
+        """Return the playlist or a segment of a stream."""
+        proxy = self._proxies.get(token)
+        if proxy is None:
+            raise web.HTTPNotFound()
+
+        try:
+            if name == STREAM_PROXY_PLAYLIST:
+                return web.Response(body=await proxy.async_playlist(), content_type=CONTENT_TYPE_PLAYLIST)
+
+            return web.Response(body=await proxy.async_segment(name), content_type=CONTENT_TYPE_SEGMENT)
+        except (ClientError, TimeoutError) as error:
+            _LOGGER.debug("Couldn't proxy '%s' of camera '%s': %s", name, proxy.device.name, error)
+            raise web.HTTPBadGateway()
@@ -0,0 +1,112 @@
+import logging
+from datetime import timedelta
+from typing import Callable, List, Optional, cast
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import TIME_MILLISECONDS
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.typing import HomeAssistantType, StateType
+
+from .const import DOMAIN, CONF_MODULE, CONF_SENSOR, API_METHODS
+from .device import ParadoxDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+# Statistics are kept in memory, polling them doesn't reach the module
+SCAN_INTERVAL = timedelta(seconds=60)
+
+
+async def async_setup_entry(
+        hass: HomeAssistantType,
+        config_entry: ConfigEntry,
+        async_add_entities: Callable[[List[Entity], bool], None]) -> None:
+    """Set up the Paradox diagnostic sensors."""
+    module = cast(ParadoxDevice, hass.data[DOMAIN][config_entry.unique_id][CONF_MODULE])
+
+    entities: List[Entity] = [
+        ParadoxApiLatencyEntity(module, method)
+        for method in API_METHODS
+    ]
+    entities.append(ParadoxReloginEntity(module))
+
+    async_add_entities(entities, False)
+
+
+class ParadoxDiagnosticEntity(Entity):
+    """Base class for the diagnostic sensors of a module."""
+
+    def __init__(self, device: ParadoxDevice, key: str) -> None:
+        """Initialize Paradox diagnostic entity."""
+        self.device = device
+        self._key = key
+
+    @property
+    def unique_id(self) -> Optional[str]:
+        """Return a unique ID."""
+        return f"{DOMAIN}-{self.device.device_info.serial}-{CONF_SENSOR}-{self._key}".lower()
+
+    @property
+    def entity_registry_enabled_default(self) -> bool:
+        """Return if the entity should be enabled when first added to the entity registry."""
+        return False
+
+    @property
+    def device_info(self):
+        """Return a device description for device registry."""
+        return {
+            "identifiers": {
+                # MAC address is not always available
+                (DOMAIN, self.device.device_info.mac or self.device.device_info.serial)
+            },
+        }
+
+
+class ParadoxApiLatencyEntity(ParadoxDiagnosticEntity):
+    """Latency of the last call to a module API, with counters and histogram as attributes."""
+
+    def __init__(self, device: ParadoxDevice, method: str) -> None:
+        """Initialize Paradox API latency entity."""
+        super().__init__(device, f"{method}_latency")
+        self._method = method
+
+    @property
+    def name(self) -> Optional[str]:
+        """Return the name of the entity."""
+        return f"{self.device.name} {self._method} latency"
+
+    @property
+    def state(self) -> StateType:
+        """Return the state of the entity."""
+        stats = self.device.stats.get(self._method)
+        if stats is None or stats.last_latency is None:
+            return None
+
+        return round(stats.last_latency * 1000)
+
+    @property
+    def unit_of_measurement(self) -> str:
+        """Return the unit of measurement."""
+        return TIME_MILLISECONDS
+
+    @property
+    def device_state_attributes(self):
+        """Return the state attributes."""
+        stats = self.device.stats.get(self._method)
+        return stats.as_dict() if stats is not None else None
+
+
+class ParadoxReloginEntity(ParadoxDiagnosticEntity):
+    """Number of times the session had to be logged in again."""
+
+    def __init__(self, device: ParadoxDevice) -> None:
+        """Initialize Paradox relogin entity."""
+        super().__init__(device, "relogins")
+
+    @property
+    def name(self) -> Optional[str]:
+        """Return the name of the entity."""
+        return f"{self.device.name} relogins"
+
+    @property
+    def state(self) -> StateType:
+        """Return the state of the entity."""
+        return self.device.relogins
@@ -0,0 +1,52 @@
+"""Paradox module API call statistics."""
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Upper bounds (in seconds) of the latency histogram buckets, the last bucket holds the rest
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+RESULT_SUCCESS = 'success'
+RESULT_FAILURE = 'failure'
+RESULT_TIMEOUT = 'timeout'
+
+
+@dataclass
+class ApiCallStats:
+    """Represent latency and result counters of an API call."""
+    success: int = 0
+    failure: int = 0
+    timeout: int = 0
+    total_time: float = 0
+    last_latency: Optional[float] = None
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    @property
+    def count(self) -> int:
+        """Return the number of calls."""
+        return self.success + self.failure + self.timeout
+
+    @property
+    def mean_latency(self) -> Optional[float]:
+        """Return the mean latency in seconds."""
+        return self.total_time / self.count if self.count else None
+
+    def record(self, latency: float, result: str) -> None:
+        """Record a call."""
+        setattr(self, result, getattr(self, result) + 1)
+        self.total_time += latency
+        self.last_latency = latency
+        self.buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def as_dict(self) -> dict:
+        """Return the statistics as a dict."""
+        labels = [f"<={bound}s" for bound in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            "count": self.count,
+            "success": self.success,
+            "failure": self.failure,
+            "timeout": self.timeout,
+            "last_latency": self.last_latency,
+            "mean_latency": self.mean_latency,
+            "histogram": dict(zip(labels, self.buckets)),
+        }
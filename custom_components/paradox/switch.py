@@ -0,0 +1,173 @@
+import logging
+from datetime import datetime
+from typing import Callable, List, Optional, Dict, Any, cast
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.typing import HomeAssistantType
+from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
+
+from . import ParadoxAlarmPanelUpdateCoordinator
+from .const import DOMAIN, CONF_MODULE, DATA_COORDINATOR, CONF_SWITCH, PGM_COMMAND_ON, PGM_COMMAND_OFF
+from .device import ParadoxDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_setup_entry(
+        hass: HomeAssistantType,
+        config_entry: ConfigEntry,
+        async_add_entities: Callable[[List[Entity], bool], None]) -> None:
+    """Set up the Paradox PGM outputs."""
+    module = cast(ParadoxDevice, hass.data[DOMAIN][config_entry.unique_id][CONF_MODULE])
+    coordinator = cast(
+        ParadoxAlarmPanelUpdateCoordinator,
+        hass.data[DOMAIN][config_entry.unique_id][DATA_COORDINATOR]
+    )
+
+    entities = [
+        ParadoxPGMEntity(module, coordinator, pgm_id)
+        for pgm_id in coordinator.pgms
+    ]
+
+    async_add_entities(entities, False)
+
+
+class ParadoxPGMEntity(SwitchEntity):
+    """PGM output of the panel.
+
+    Commands are applied optimistically and confirmed by the coordinator data. The optimistic
+    state is rolled back if the module refuses the command, or dropped if the panel still doesn't
+    report it after the fast scan window.
+    """
+
+    def __init__(self, device: ParadoxDevice, coordinator: ParadoxAlarmPanelUpdateCoordinator,
+                 pgm_id: int) -> None:
+        """Initialize Paradox PGM entity."""
+        self.device = device
+        self._coordinator = coordinator
+        self._pgm_id = pgm_id
+        self._pgm: dict = {}
+        self._optimistic_state: Optional[bool] = None
+        self._unsub_optimistic: Optional[Callable[[], None]] = None
+
+        self._get_pgm_from_coordinator()
+
+    def _get_pgm_from_coordinator(self) -> None:
+        self._pgm = self._coordinator.pgms.get(self._pgm_id, self._pgm)
+
+    @property
+    def should_poll(self) -> bool:
+        """Not needed. Update from Data Coordinator"""
+        return False
+
+    @property
+    def unique_id(self) -> Optional[str]:
+        """Return a unique ID."""
+        return f"{DOMAIN}-{self.device.panel_info.serial}-{CONF_SWITCH}-{self._pgm_id}".lower()
+
+    @property
+    def name(self) -> Optional[str]:
+        """Return the name of the entity."""
+        return str(self._pgm.get('PGMLabel')).strip()
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if the PGM is on."""
+        if self._optimistic_state is not None:
+            return self._optimistic_state
+
+        return bool(self._pgm.get('On'))
+
+    @property
+    def assumed_state(self) -> bool:
+        """Return True while the state was not confirmed by the panel."""
+        return self._optimistic_state is not None
+
+    @property
+    def device_info(self) -> Optional[Dict[str, Any]]:
+        """Return device specific attributes."""
+        device_info = {
+            "via_device": (DOMAIN, self.device.device_info.mac or self.device.device_info.serial),
+            "name": self.device.panel_info.name,
+            "identifiers": {
+                # MAC address is not always available
+                (DOMAIN, self.device.panel_info.mac or self.device.panel_info.serial)
+            },
+            "manufacturer": self.device.panel_info.manufacturer,
+            "model": self.device.panel_info.model,
+            "sw_version": self.device.panel_info.sw_version,
+        }
+
+        if self.device.panel_info.mac:
+            device_info["connections"] = {
+                (CONNECTION_NETWORK_MAC, self.device.panel_info.mac)
+            }
+
+        return device_info
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available."""
+        return self.device.available and self._coordinator.last_update_success
+
+    async def async_added_to_hass(self):
+        """When entity is added to hass."""
+        self.async_on_remove(
+            self._coordinator.async_add_pgm_listener(
+                self._pgm_id, self._handle_coordinator_update
+            )
+        )
+
+    async def async_will_remove_from_hass(self):
+        """When entity will be removed from hass."""
+        self._clear_optimistic_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Drop the optimistic state once the panel confirms it."""
+        self._get_pgm_from_coordinator()
+        if self._optimistic_state is not None and bool(self._pgm.get('On')) == self._optimistic_state:
+            self._clear_optimistic_state()
+
+        self.async_write_ha_state()
+
+    @callback
+    def _clear_optimistic_state(self) -> None:
+        """Forget the optimistic state and its expiry."""
+        self._optimistic_state = None
+        if self._unsub_optimistic is not None:
+            self._unsub_optimistic()
+            self._unsub_optimistic = None
+
+    @callback
+    def _async_expire_optimistic_state(self, now: datetime) -> None:
+        """Show the state reported by the panel when it didn't confirm the command in time."""
+        self._unsub_optimistic = None
+        self._optimistic_state = None
+        self.async_write_ha_state()
+
+    async def async_turn_on(self, **kwargs):
+        """Turn the PGM on."""
+        await self._send_pgm_command(True)
+
+    async def async_turn_off(self, **kwargs):
+        """Turn the PGM off."""
+        await self._send_pgm_command(False)
+
+    async def _send_pgm_command(self, state: bool):
+        """Send PGM command."""
+        self._clear_optimistic_state()
+        self._optimistic_state = state
+        self._unsub_optimistic = async_call_later(
+            self.hass, self._coordinator.fast_scan_window.total_seconds(), self._async_expire_optimistic_state
+        )
+        self.async_write_ha_state()
+
+        self._coordinator.async_fast_poll()
+        command = PGM_COMMAND_ON if state else PGM_COMMAND_OFF
+        if not await self.device.async_queue_pgm_command(self._pgm_id, command, self._pgm.get('SerialNo', '')):
+            self._clear_optimistic_state()
+            self.async_write_ha_state()
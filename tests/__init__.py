@@ -0,0 +1,121 @@
+"""Tests for the Paradox integration."""
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from homeassistant.const import (CONF_NAME, CONF_HOST, CONF_PORT, CONF_USERNAME, CONF_PASSWORD, CONF_DOMAIN,
+                                 CONF_DEVICE, CONF_SCAN_INTERVAL)
+from homeassistant.helpers.typing import HomeAssistantType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.paradox.const import (DOMAIN, STORAGE_VERSION, CONF_MODEL, CONF_USERCODE, CONF_MODULE,
+                                             DATA_COORDINATOR, CONF_ALARM_CONTROL_PANEL, CONF_BINARY_SENSOR,
+                                             CONF_SWITCH)
+
+from .simulator import HD77Simulator
+
+ALARM_DOMAINS = [CONF_ALARM_CONTROL_PANEL, CONF_BINARY_SENSOR, CONF_SWITCH]
+# Long enough that no poll happens during a test
+SLOW_POLL = {CONF_DEVICE: {CONF_SCAN_INTERVAL: 3600}}
+
+# Master playlist recorded from an HD77, the CODECS attribute holds a quoted comma
+HD77_PLAYLIST = """#EXTM3U
+#EXT-X-VERSION:3
+#EXT-X-STREAM-INF:PROGRAM-ID=1,BANDWIDTH=128000,RESOLUTION=640x360,CODECS="avc1.4d401f,mp4a.40.2"
+http://192.168.1.20:80/hls/5f2b1c0e/low/index.m3u8
+#EXT-X-STREAM-INF:PROGRAM-ID=1,BANDWIDTH=256000,RESOLUTION=1280x720,CODECS="avc1.4d401f,mp4a.40.2"
+http://192.168.1.20:80/hls/5f2b1c0e/normal/index.m3u8
+#EXT-X-STREAM-INF:PROGRAM-ID=1,BANDWIDTH=512000,RESOLUTION=1280x720,CODECS="avc1.4d401f,mp4a.40.2"
+http://192.168.1.20:80/hls/5f2b1c0e/high/index.m3u8
+"""
+
+# JPEG markers around a payload, as the MJPEG decoder splits frames on them
+FFMPEG_FRAME = b'\xff\xd8fake frame\xff\xd9'
+FFMPEG_SCRIPT = """#!{python}
+import sys
+
+with open({args!r}, 'a') as file:
+    file.write(' '.join(sys.argv[1:]) + '\\n')
+
+# A snapshot asks for a single frame, a stream outputs frames until it is stopped with q
+for _ in range(1 if '-frames:v' in sys.argv else {frames}):
+    sys.stdout.buffer.write({frame!r})
+    sys.stdout.buffer.flush()
+sys.stdin.read(1)
+"""
+
+
+def create_fake_ffmpeg(directory: Path, frames: int = 3) -> str:
+    """Write an executable that acts as ffmpeg and logs its arguments to ffmpeg.args in the same directory."""
+    binary = directory / 'ffmpeg'
+    binary.write_text(FFMPEG_SCRIPT.format(
+        python=sys.executable, args=str(directory / 'ffmpeg.args'), frames=frames, frame=FFMPEG_FRAME
+    ))
+    os.chmod(binary, 0o755)
+    return str(binary)
+
+
+def read_ffmpeg_args(directory: Path) -> List[str]:
+    """Return the command lines the fake ffmpeg of a directory was started with, but the version probes."""
+    path = directory / 'ffmpeg.args'
+    lines = path.read_text().splitlines() if path.exists() else []
+    return [line for line in lines if not line.startswith('-version')]
+
+
+def create_config_entry(hass: HomeAssistantType, simulator: HD77Simulator, domains: Optional[List[str]] = None,
+                        options: Optional[dict] = None) -> MockConfigEntry:
+    """Add a config entry of the module emulated by a simulator."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        unique_id=f"{DOMAIN}-{simulator.serial}",
+        title=f"HD77 {simulator.label}",
+        data={
+            CONF_NAME: simulator.label,
+            CONF_MODEL: 'HD77',
+            CONF_HOST: simulator.host,
+            CONF_PORT: simulator.port,
+            CONF_PASSWORD: simulator.password,
+            CONF_USERNAME: 'master',
+            CONF_USERCODE: simulator.usercode,
+            CONF_DOMAIN: ALARM_DOMAINS if domains is None else domains,
+        },
+        options=options or {},
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def async_setup_module(hass: HomeAssistantType, simulator: HD77Simulator, domains: Optional[List[str]] = None,
+                             options: Optional[dict] = None) -> MockConfigEntry:
+    """Set up the integration for the module emulated by a simulator."""
+    entry = create_config_entry(hass, simulator, domains, options)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def save_module_data(hass_storage: dict, entry: MockConfigEntry, simulator: HD77Simulator,
+                     topology: Optional[dict]) -> None:
+    """Save the data of a previous setup of the module."""
+    hass_storage[f"paradox.{entry.entry_id}"] = {
+        'version': STORAGE_VERSION,
+        'key': f"paradox.{entry.entry_id}",
+        'data': {
+            'device_info': {'manufacturer': 'Paradox, Inc', 'model': 'HD77', 'name': simulator.label,
+                            'sw_version': '1.34.4', 'serial': simulator.serial, 'mac': None},
+            'panel_info': {'manufacturer': 'Paradox, Inc', 'model': '', 'name': 'Paradox Control Panel',
+                           'sw_version': '7.50', 'serial': f"ca{simulator.serial}", 'mac': None},
+            'topology': topology,
+        },
+    }
+
+
+def get_module(hass: HomeAssistantType, entry: MockConfigEntry):
+    """Return the module of a config entry."""
+    return hass.data[DOMAIN][entry.unique_id][CONF_MODULE]
+
+
+def get_coordinator(hass: HomeAssistantType, entry: MockConfigEntry):
+    """Return the alarm panel coordinator of a config entry."""
+    return hass.data[DOMAIN][entry.unique_id][DATA_COORDINATOR]
@@ -0,0 +1,39 @@
+"""Fixtures for the Paradox integration tests."""
+import pytest
+
+from .simulator import HD77Simulator
+
+
+def pytest_addoption(parser):
+    """Add the report only mode of the benchmarks."""
+    parser.addoption('--report-only', action='store_true',
+                     help="print the benchmark measures without failing on their time budgets")
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components."""
+    yield
+
+
+@pytest.fixture
+async def simulators(hass):
+    """Return a factory of started HD77 simulators, each with its own serial and port."""
+    started = []
+
+    async def start(**kwargs) -> HD77Simulator:
+        simulator = HD77Simulator(serial=f"{len(started) + 1:08x}", **kwargs)
+        await simulator.async_start()
+        started.append(simulator)
+        return simulator
+
+    yield start
+
+    for simulator in started:
+        await simulator.async_stop()
+
+
+@pytest.fixture
+async def simulator(simulators) -> HD77Simulator:
+    """Return a started HD77 simulator."""
+    return await simulators()
@@ -0,0 +1,327 @@
+"""Local simulator of the web API of a Paradox HD77 camera."""
+import asyncio
+import secrets
+from collections import Counter
+from time import monotonic
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+# Result codes checked by pypdxapi
+RESULT_LOGIN = 33554432
+RESULT_GETSTATUS = 33619968
+RESULT_ROD = 33816578
+RESULT_PINGSTATUS = 35127296
+# Answers that pypdxapi doesn't check, and a rejected session or request
+RESULT_CONTROL = 33685504
+RESULT_REJECTED = 33554435
+
+# Injected failures
+FAILURE_DROP = 'drop'
+FAILURE_REJECT = 'reject'
+FAILURE_TIMEOUT = 'timeout'
+
+# Area commands of areacontrol and the arming level they lead to
+AREA_ARMING_LEVELS = {2: 1, 3: 3, 4: 1, 5: 1, 6: 0}
+PGM_COMMAND_ON = 0
+
+# Recorded variant table of an HD77, the uris are served by the simulator
+VOD_VARIANTS = (
+    ('low', 128000, '640x360'),
+    ('normal', 256000, '1280x720'),
+    ('high', 512000, '1280x720'),
+)
+SEGMENT_DURATION = 2
+PLAYLIST_SEGMENTS = 3
+
+
+class HD77Simulator:
+    """Serves the HD77 endpoints used by the integration.
+
+    login, pingstatus, getstatus, vod, areacontrol, pgmcontrol and rod behave like the module:
+    sessions are checked, commands change the panel state and vod returns a master playlist whose
+    variants and segments are served too. Latency and failures can be injected per endpoint.
+    """
+
+    def __init__(self, serial: str = '0000a1b2', label: str = 'Simulated HD77', areas: int = 1, zones: int = 2,
+                 pgms: int = 1, password: str = 'paradox', usercode: str = '1234', latency: float = 0) -> None:
+        """Initialize"""
+        self.serial = serial
+        self.label = label
+        self.password = password
+        self.usercode = usercode
+        self.latency = latency
+        self.latencies: Dict[str, float] = {}
+        self.failures: Dict[str, List[str]] = {}
+        self.requests: Counter = Counter()
+        self.commands: Dict[str, List[List[dict]]] = {'areacontrol': [], 'pgmcontrol': []}
+        self.session_key: Optional[str] = None
+        self.recording = False
+        self.areas = [
+            {'AreaId': area_id, 'AreaLabel': f"Area {area_id}", 'ArmingLevelID': 0, 'InAlarm': False,
+             'Ready': True}
+            for area_id in range(1, areas + 1)
+        ]
+        self.zones = [
+            {'ZoneId': zone_id, 'ZoneLabel': f"Zone {zone_id}", 'AreaId': (zone_id - 1) % areas + 1,
+             'Open': False, 'Bypassed': False, 'Tampered': False, 'InAlarm': False}
+            for zone_id in range(1, zones + 1)
+        ]
+        self.pgms = [
+            {'PGMId': pgm_id, 'PGMLabel': f"PGM {pgm_id}", 'SerialNo': f"{serial}{pgm_id:02x}", 'On': False}
+            for pgm_id in range(1, pgms + 1)
+        ]
+        self._started = monotonic()
+        self._runner: Optional[web.AppRunner] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self.port: Optional[int] = None
+
+        self.app = web.Application()
+        self.app.router.add_post('/app/login', self._login)
+        self.app.router.add_post('/app/logout', self._logout)
+        self.app.router.add_post('/app/pingstatus', self._pingstatus)
+        self.app.router.add_post('/app/getstatus', self._getstatus)
+        self.app.router.add_post('/app/areacontrol', self._areacontrol)
+        self.app.router.add_post('/app/pgmcontrol', self._pgmcontrol)
+        self.app.router.add_post('/app/rod', self._rod)
+        self.app.router.add_post('/hls/vod', self._vod)
+        self.app.router.add_get('/hls/{session}/{channel}/index.m3u8', self._media_playlist)
+        self.app.router.add_get('/hls/{session}/{channel}/{sequence}.ts', self._segment)
+
+    @property
+    def host(self) -> str:
+        """Return the host the simulator listens on."""
+        return '127.0.0.1'
+
+    async def async_start(self) -> None:
+        """Listen on a free local port."""
+        self._stopping = asyncio.Event()
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, 0).start()
+        self.port = self._runner.addresses[0][1]
+
+    async def async_stop(self) -> None:
+        """Stop listening."""
+        if self._stopping is not None:
+            self._stopping.set()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def fail(self, endpoint: str, failure: str, count: int = 1) -> None:
+        """Make the next requests to an endpoint fail.
+
+        :param endpoint: Name of the endpoint, e.g. pingstatus.
+        :param failure: FAILURE_DROP closes the connection, FAILURE_REJECT answers with an error
+            result code and FAILURE_TIMEOUT doesn't answer within the request timeout.
+        :param count: Number of requests that fail.
+        """
+        self.failures.setdefault(endpoint, []).extend([failure] * count)
+
+    def expire_session(self) -> None:
+        """Forget the session, like the module does after a reboot."""
+        self.session_key = None
+
+    def set_area(self, area_id: int, **status) -> None:
+        """Change the status of an area, e.g. to raise an alarm."""
+        for area in self.areas:
+            if area['AreaId'] == area_id:
+                area.update(status)
+
+    async def _async_handle(self, request: web.Request, endpoint: str) -> Optional[web.Response]:
+        """Count the request, wait for the latency and apply the injected failure.
+
+        :return: The response of a failed request, None to answer normally.
+        """
+        self.requests[endpoint] += 1
+        latency = self.latencies.get(endpoint, self.latency)
+        if latency:
+            await asyncio.sleep(latency)
+
+        failures = self.failures.get(endpoint)
+        if not failures:
+            return None
+
+        failure = failures.pop(0)
+        if failure == FAILURE_TIMEOUT:
+            # Answer only when the simulator stops, long after the client gave up
+            await self._stopping.wait()
+        if failure == FAILURE_DROP:
+            request.transport.close()
+            raise asyncio.CancelledError()
+
+        return self._rejected()
+
+    @staticmethod
+    def _rejected() -> web.Response:
+        """Answer a request the module refused."""
+        return web.json_response({'ResultCode': RESULT_REJECTED, 'ResultStr': 'Invalid session'})
+
+    def _session_valid(self, payload: dict) -> bool:
+        """Return True if the request carries the current session key."""
+        return self.session_key is not None and payload.get('SessionKey') == self.session_key
+
+    async def _login(self, request: web.Request) -> web.Response:
+        """Log in and start a new session."""
+        response = await self._async_handle(request, 'login')
+        if response is not None:
+            return response
+
+        payload = await request.json()
+        if payload.get('ServerPassword') != self.password or payload.get('UserCode') != self.usercode:
+            return web.json_response({'ResultCode': RESULT_REJECTED, 'ResultStr': 'Invalid credentials'})
+
+        self.session_key = secrets.token_hex(8)
+        return web.json_response({
+            'ResultCode': RESULT_LOGIN,
+            'ResultStr': 'Login successful',
+            'sessionKey': self.session_key,
+            'Server': {
+                'Label': f"{self.label} ",
+                'SerialNo': self.serial,
+                'SdCardVersion': '1.34.4',
+            },
+            'ParadoxCP': {
+                'Version': 7,
+                'Revision': 50,
+                'SerialNo': f"ca{self.serial}",
+            },
+        })
+
+    async def _logout(self, request: web.Request) -> web.Response:
+        """End the session."""
+        await self._async_handle(request, 'logout')
+        self.session_key = None
+        return web.json_response({'ResultCode': RESULT_CONTROL})
+
+    async def _pingstatus(self, request: web.Request) -> web.Response:
+        """Return the status of the areas, zones and PGMs. No session is needed."""
+        response = await self._async_handle(request, 'pingstatus')
+        if response is not None:
+            return response
+
+        return web.json_response({
+            'ResultCode': RESULT_PINGSTATUS,
+            'ResultStr': 'Ping status successful',
+            'AreaStatus': self.areas,
+            'ZoneStatus': self.zones,
+            'PGMStatus': self.pgms,
+        })
+
+    async def _getstatus(self, request: web.Request) -> web.Response:
+        """Keep the session alive."""
+        response = await self._async_handle(request, 'getstatus')
+        if response is not None:
+            return response
+
+        if not self._session_valid(await request.json()):
+            return self._rejected()
+
+        return web.json_response({'ResultCode': RESULT_GETSTATUS})
+
+    async def _areacontrol(self, request: web.Request) -> web.Response:
+        """Arm or disarm areas."""
+        response = await self._async_handle(request, 'areacontrol')
+        if response is not None:
+            return response
+
+        payload = await request.json()
+        if not self._session_valid(payload):
+            return self._rejected()
+
+        self.commands['areacontrol'].append(payload['AreaCommands'])
+        for command in payload['AreaCommands']:
+            self.set_area(command['AreaID'], ArmingLevelID=AREA_ARMING_LEVELS[command['AreaCommand']])
+
+        return web.json_response({'ResultCode': RESULT_CONTROL})
+
+    async def _pgmcontrol(self, request: web.Request) -> web.Response:
+        """Switch PGMs on or off."""
+        response = await self._async_handle(request, 'pgmcontrol')
+        if response is not None:
+            return response
+
+        payload = await request.json()
+        if not self._session_valid(payload):
+            return self._rejected()
+
+        self.commands['pgmcontrol'].append(payload['PGMCommands'])
+        for command in payload['PGMCommands']:
+            for pgm in self.pgms:
+                if pgm['PGMId'] == command['PGMID']:
+                    pgm['On'] = command['PGMCommand'] == PGM_COMMAND_ON
+
+        return web.json_response({'ResultCode': RESULT_CONTROL})
+
+    async def _rod(self, request: web.Request) -> web.Response:
+        """Start or stop recording on demand."""
+        response = await self._async_handle(request, 'rod')
+        if response is not None:
+            return response
+
+        payload = await request.json()
+        if not self._session_valid(payload):
+            return self._rejected()
+
+        self.recording = payload['Action'] == 3
+        return web.json_response({'ResultCode': RESULT_ROD})
+
+    async def _vod(self, request: web.Request) -> web.Response:
+        """Return the master playlist of the session."""
+        response = await self._async_handle(request, 'vod')
+        if response is not None:
+            return response
+
+        if not self._session_valid(await request.json()):
+            return self._rejected()
+
+        # pypdxapi compares the content type case sensitively
+        return web.Response(text=self.master_playlist(), headers={'Content-Type': 'audio/x-mpegURL'})
+
+    def master_playlist(self) -> str:
+        """Return the master playlist, with the variant uris bound to the current session."""
+        lines = ['#EXTM3U', '#EXT-X-VERSION:3']
+        for channel, bandwidth, resolution in VOD_VARIANTS:
+            lines.append(f'#EXT-X-STREAM-INF:PROGRAM-ID=1,BANDWIDTH={bandwidth},RESOLUTION={resolution},'
+                         f'CODECS="avc1.4d401f,mp4a.40.2"')
+            lines.append(f"http://{self.host}:{self.port}/hls/{self.session_key}/{channel}/index.m3u8")
+
+        return '\n'.join(lines) + '\n'
+
+    def _current_sequence(self) -> int:
+        """Return the sequence of the last segment, a new one is produced every segment duration."""
+        return int((monotonic() - self._started) // SEGMENT_DURATION) + PLAYLIST_SEGMENTS
+
+    async def _media_playlist(self, request: web.Request) -> web.Response:
+        """Return the live media playlist of a variant."""
+        response = await self._async_handle(request, 'playlist')
+        if response is not None:
+            return response
+
+        if request.match_info['session'] != self.session_key:
+            raise web.HTTPNotFound()
+
+        last = self._current_sequence()
+        first = last - PLAYLIST_SEGMENTS + 1
+        lines = ['#EXTM3U', '#EXT-X-VERSION:3', f"#EXT-X-TARGETDURATION:{SEGMENT_DURATION}",
+                 f"#EXT-X-MEDIA-SEQUENCE:{first}"]
+        for sequence in range(first, last + 1):
+            lines.append(f"#EXTINF:{SEGMENT_DURATION}.000,")
+            lines.append(f"{sequence}.ts")
+
+        return web.Response(text='\n'.join(lines) + '\n', content_type='application/vnd.apple.mpegurl')
+
+    async def _segment(self, request: web.Request) -> web.Response:
+        """Return a segment with the size of the variant bandwidth."""
+        response = await self._async_handle(request, 'segment')
+        if response is not None:
+            return response
+
+        bandwidths = {channel: bandwidth for channel, bandwidth, _ in VOD_VARIANTS}
+        channel = request.match_info['channel']
+        if request.match_info['session'] != self.session_key or channel not in bandwidths:
+            raise web.HTTPNotFound()
+
+        size = bandwidths[channel] * SEGMENT_DURATION // 8
+        return web.Response(body=b'\x47' * size, content_type='video/mp2t')
@@ -0,0 +1,215 @@
+"""Benchmarks of the Paradox integration against simulated HD77 modules.
+
+Run with ``pytest -m benchmark -s`` to print the measures. The budgets are set well above the
+measures on a laptop, so they only fail on a regression of the order of magnitude, e.g. modules
+polled one by one, entities written on every refresh or a stream url renegotiated on every call.
+With ``--report-only`` the time budgets are printed but not enforced, as on shared CI runners.
+"""
+import asyncio
+import math
+from time import perf_counter
+from typing import Awaitable, Callable, List
+
+import pytest
+
+from custom_components.paradox.const import (CONF_CAMERA, DEFAULT_COMMAND_WINDOW, DEFAULT_MAX_CONCURRENT_UPDATES,
+                                             STATUS_AREAS, STATUS_ZONES, STATUS_PGMS)
+from custom_components.paradox.device import ParadoxDevice
+from custom_components.paradox.playlist import parse_variants
+
+from . import HD77_PLAYLIST, SLOW_POLL, async_setup_module, create_config_entry, get_coordinator, get_module
+from .simulator import HD77Simulator
+
+pytestmark = pytest.mark.benchmark
+
+MODULES = [1, 10, 50]
+AREAS = [8, 32, 64]
+ROUNDS = 5
+# Response time of the simulated modules, and the time allowed per module on top of it
+MODULE_LATENCY = 0.05
+MODULE_BUDGET = 0.005
+
+
+async def measure(operation: Callable[[], Awaitable], rounds: int = ROUNDS) -> float:
+    """Return the mean duration of an operation in seconds."""
+    total = 0
+    for _ in range(rounds):
+        start = perf_counter()
+        await operation()
+        total += perf_counter() - start
+
+    return total / rounds
+
+
+def report(name: str, count: int, duration: float, budget: float) -> None:
+    """Print a measure next to its budget."""
+    print(f"\n{name} x{count}: {duration * 1000:.2f} ms (budget {budget * 1000:.2f} ms)")
+
+
+@pytest.fixture
+def within_budget(request) -> Callable[[float, float], bool]:
+    """Return a check of a measure against its budget, always met in the report only mode."""
+    report_only = request.config.getoption('report_only')
+    return lambda duration, budget: report_only or duration < budget
+
+
+async def async_start_modules(simulators, count: int) -> List[HD77Simulator]:
+    """Start the simulators of several modules."""
+    return [await simulators() for _ in range(count)]
+
+
+def set_latency(modules: List[HD77Simulator]) -> None:
+    """Make the modules answer with the latency of a real module once they are set up."""
+    for simulator in modules:
+        simulator.latency = MODULE_LATENCY
+
+
+@pytest.mark.parametrize('count', MODULES)
+async def test_coordinator_refresh(hass, simulators, count, within_budget):
+    """Measure a refresh of every module. Modules are polled concurrently up to the hub limit."""
+    modules = await async_start_modules(simulators, count)
+    entries = [await async_setup_module(hass, simulator, options=SLOW_POLL) for simulator in modules]
+    coordinators = [get_coordinator(hass, entry) for entry in entries]
+    set_latency(modules)
+
+    async def refresh():
+        await asyncio.gather(*[coordinator.async_refresh() for coordinator in coordinators])
+
+    duration = await measure(refresh)
+    # Polling the modules one by one would take count * MODULE_LATENCY
+    budget = math.ceil(count / DEFAULT_MAX_CONCURRENT_UPDATES) * MODULE_LATENCY * 1.5 + count * MODULE_BUDGET
+    report('coordinator refresh', count, duration, budget)
+
+    assert all(coordinator.last_update_success for coordinator in coordinators)
+    # One pingstatus per refresh, the session is kept alive without logging in again
+    assert all(simulator.requests['pingstatus'] == ROUNDS + 1 for simulator in modules)
+    assert all(simulator.requests['login'] == 1 for simulator in modules)
+    assert within_budget(duration, budget)
+
+
+@pytest.mark.parametrize('areas', AREAS)
+async def test_entity_fan_out(hass, simulators, areas, within_budget):
+    """Measure a refresh that changes one area, only its entity is written."""
+    simulator = await simulators(areas=areas, zones=areas * 2, pgms=areas // 4)
+    entry = await async_setup_module(hass, simulator, options=SLOW_POLL)
+    coordinator = get_coordinator(hass, entry)
+
+    written = []
+    hass.bus.async_listen('state_changed', lambda event: written.append(event.data['entity_id']))
+    level = iter(range(1, ROUNDS * 2, 2))
+
+    async def refresh():
+        simulator.set_area(1, ArmingLevelID=next(level) % 4)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    duration = await measure(refresh)
+    budget = MODULE_BUDGET * 4
+    report('refresh fan-out, areas', areas, duration, budget)
+
+    assert set(written) == {'alarm_control_panel.area_1'}
+    assert within_budget(duration, budget)
+
+
+@pytest.mark.parametrize('areas', AREAS)
+async def test_area_index(hass, simulators, areas, within_budget):
+    """Measure the per-poll cost of resolving every area, zone and PGM of a new payload."""
+    simulator = await simulators(areas=areas, zones=areas * 2, pgms=areas // 4)
+    entry = await async_setup_module(hass, simulator, options=SLOW_POLL)
+    coordinator = get_coordinator(hass, entry)
+    data = dict(coordinator.data)
+    ids = {
+        STATUS_AREAS: [item['AreaId'] for item in data[STATUS_AREAS]],
+        STATUS_ZONES: [item['ZoneId'] for item in data[STATUS_ZONES]],
+        STATUS_PGMS: [item['PGMId'] for item in data[STATUS_PGMS]],
+    }
+
+    async def poll():
+        # A new payload, like every refresh, then every entity reads its item
+        coordinator.data = dict(data)
+        for area_id in ids[STATUS_AREAS]:
+            assert coordinator.areas[area_id]
+        for zone_id in ids[STATUS_ZONES]:
+            assert coordinator.zones[zone_id]
+        for pgm_id in ids[STATUS_PGMS]:
+            assert coordinator.pgms[pgm_id]
+
+    duration = await measure(poll, rounds=100)
+    # Linear in the number of items, a scan per entity would be quadratic
+    budget = areas * 4 * 0.000002
+    report('area index, areas', areas, duration, budget)
+
+    assert within_budget(duration, budget)
+
+
+@pytest.mark.parametrize('count', MODULES)
+async def test_command_round_trip(hass, simulators, count, within_budget):
+    """Measure an area command sent to every module, from the queue to the module answer."""
+    modules = await async_start_modules(simulators, count)
+    entries = [await async_setup_module(hass, simulator, options=SLOW_POLL) for simulator in modules]
+    devices = [get_module(hass, entry) for entry in entries]
+    set_latency(modules)
+    command = iter(range(ROUNDS))
+
+    async def send():
+        area_command = 2 if next(command) % 2 else 6
+        results = await asyncio.gather(*[device.async_queue_area_command(1, area_command) for device in devices])
+        assert all(results)
+
+    duration = await measure(send)
+    await hass.async_block_till_done()
+    budget = DEFAULT_COMMAND_WINDOW + MODULE_LATENCY * 2 + count * MODULE_BUDGET
+    report('command round trip', count, duration, budget)
+
+    assert all(len(simulator.commands['areacontrol']) == ROUNDS for simulator in modules)
+    assert within_budget(duration, budget)
+
+
+@pytest.mark.parametrize('count', MODULES)
+async def test_stream_source_resolution(hass, simulators, count, within_budget):
+    """Measure the stream url resolution of every camera, cold and then from the session cache."""
+    modules = await async_start_modules(simulators, count)
+    devices = [ParadoxDevice(hass, create_config_entry(hass, simulator, domains=[CONF_CAMERA]))
+               for simulator in modules]
+    await asyncio.gather(*[device.async_setup() for device in devices])
+    await hass.async_block_till_done()
+    set_latency(modules)
+
+    async def resolve():
+        sources = await asyncio.gather(*[device.async_stream_source() for device in devices])
+        assert all(sources)
+
+    # The login prefetches the url, drop it to measure a cold resolution
+    for device in devices:
+        device._last_stream_source = None
+        device._stream_variants = {}
+    cold = await measure(resolve, rounds=1)
+    warm = await measure(resolve, rounds=100)
+    budget = MODULE_LATENCY * 2 + count * MODULE_BUDGET
+    cached_budget = count * 0.0002
+    report('stream source cold', count, cold, budget)
+    report('stream source cached', count, warm, cached_budget)
+
+    # One vod for the prefetch and one for the cold resolution, none from the cache
+    assert all(simulator.requests['vod'] == 2 for simulator in modules)
+    assert within_budget(cold, budget)
+    assert within_budget(warm, cached_budget)
+
+    for device in devices:
+        await device.async_unload()
+
+
+@pytest.mark.parametrize('variants', [3, 300])
+def test_playlist_parse(variants, within_budget):
+    """Measure how long parsing a master playlist blocks the event loop."""
+    lines = HD77_PLAYLIST.splitlines()
+    playlist = '\n'.join(lines[:2] + lines[2:4] * variants) + '\n'
+
+    start = perf_counter()
+    for _ in range(100):
+        assert len(parse_variants(playlist)) == variants
+    duration = (perf_counter() - start) / 100
+    budget = variants * 0.00002
+    report('playlist parse, variants', variants, duration, budget)
+
+    assert within_budget(duration, budget)
@@ -0,0 +1,97 @@
+"""Tests for the camera of the Paradox integration."""
+import asyncio
+from datetime import timedelta
+
+from homeassistant.components.camera import async_get_image
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+from pytest_homeassistant_custom_component.common import async_capture_events, async_fire_time_changed
+
+from custom_components.paradox.const import (CONF_CAMERA, CONF_STREAM_PROXY, CONF_PRE_EVENT_FRAMES,
+                                             EVENT_PRE_EVENT_SAVED)
+
+from . import (ALARM_DOMAINS, FFMPEG_FRAME, SLOW_POLL, async_setup_module, create_fake_ffmpeg, get_coordinator,
+               read_ffmpeg_args)
+
+INTERNAL_URL = 'http://homeassistant.local:8123'
+PROXY = {CONF_CAMERA: {CONF_STREAM_PROXY: True}}
+PRE_EVENT = {**SLOW_POLL, CONF_CAMERA: {CONF_PRE_EVENT_FRAMES: 5}}
+
+
+def get_camera(hass):
+    """Return the camera entity of the simulated module."""
+    return hass.data['camera'].get_entity('camera.simulated_hd77')
+
+
+async def test_stream_proxy(hass, simulator, aiohttp_client):
+    """Test the viewers of the proxied stream share a single download of each segment."""
+    assert await async_setup_component(hass, 'http', {})
+    hass.config.internal_url = INTERNAL_URL
+    await async_setup_module(hass, simulator, domains=[CONF_CAMERA], options=PROXY)
+    client = await aiohttp_client(hass.http.app)
+
+    source = await get_camera(hass).stream_source()
+    assert source.startswith(f"{INTERNAL_URL}/api/paradox/stream/")
+    path = source[len(INTERNAL_URL):]
+
+    response = await client.get(path)
+    assert response.status == 200
+    segment = [line for line in (await response.text()).splitlines() if line.endswith('.ts')][0]
+
+    responses = await asyncio.gather(*[client.get(path.replace('playlist.m3u8', segment)) for _ in range(3)])
+    assert [response.status for response in responses] == [200, 200, 200]
+    assert simulator.requests['playlist'] == 1
+    assert simulator.requests['segment'] == 1
+
+    assert (await client.get(path.replace('playlist.m3u8', '999.ts'))).status == 404
+    assert (await client.get('/api/paradox/stream/unknown/playlist.m3u8')).status == 404
+
+
+async def test_stream_proxy_without_internal_url(hass, simulator):
+    """Test the camera streams from the module when Home Assistant has no internal url."""
+    assert await async_setup_component(hass, 'http', {})
+    await async_setup_module(hass, simulator, domains=[CONF_CAMERA], options=PROXY)
+
+    source = await get_camera(hass).stream_source()
+    assert source.startswith(f"http://{simulator.host}:{simulator.port}/hls/")
+
+
+async def test_snapshot(hass, simulator, tmp_path):
+    """Test a snapshot is decoded by ffmpeg from the stream and cached."""
+    assert await async_setup_component(hass, 'ffmpeg', {'ffmpeg': {'ffmpeg_bin': create_fake_ffmpeg(tmp_path)}})
+    await async_setup_module(hass, simulator, domains=[CONF_CAMERA])
+
+    assert (await async_get_image(hass, 'camera.simulated_hd77')).content == FFMPEG_FRAME
+    assert (await async_get_image(hass, 'camera.simulated_hd77')).content == FFMPEG_FRAME
+    assert len(read_ffmpeg_args(tmp_path)) == 1
+
+
+async def test_pre_event_frames(hass, simulator, tmp_path):
+    """Test the frames decoded before an alarm are buffered and saved when an area goes into alarm."""
+    hass.config.config_dir = str(tmp_path)
+    assert await async_setup_component(hass, 'ffmpeg', {'ffmpeg': {'ffmpeg_bin': create_fake_ffmpeg(tmp_path)}})
+    entry = await async_setup_module(hass, simulator, domains=ALARM_DOMAINS + [CONF_CAMERA], options=PRE_EVENT)
+    saved = async_capture_events(hass, EVENT_PRE_EVENT_SAVED)
+
+    # ffmpeg only outputs the frames that are buffered
+    for _ in range(100):
+        if read_ffmpeg_args(tmp_path):
+            break
+        await asyncio.sleep(0.05)
+    assert read_ffmpeg_args(tmp_path)[0].endswith('-r 1 -f mpjpeg -')
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+
+    simulator.set_area(1, InAlarm=True)
+    await get_coordinator(hass, entry).async_refresh()
+    await hass.async_block_till_done()
+
+    assert len(saved) == 1
+    assert saved[0].data['entity_id'] == 'camera.simulated_hd77'
+    assert saved[0].data['area_id'] == 1
+    files = saved[0].data['files']
+    assert len(files) == 1
+    assert files[0].startswith(str(tmp_path / 'paradox_events' / simulator.serial))
+    with open(files[0], 'rb') as file:
+        assert file.read() == FFMPEG_FRAME
@@ -0,0 +1,29 @@
+"""Tests for the shared ffmpeg decoder of the Paradox cameras."""
+from custom_components.paradox.decoder import ParadoxCameraDecoder
+
+from . import FFMPEG_FRAME, create_fake_ffmpeg, read_ffmpeg_args
+
+STREAM_URL = 'http://192.168.1.20/hls/5f2b1c0e/low/index.m3u8'
+
+
+async def stream_source() -> str:
+    """Return the url of the camera stream."""
+    return STREAM_URL
+
+
+async def test_decoder(hass, tmp_path):
+    """Test ffmpeg decodes the stream while the decoder is acquired and its frames are shared."""
+    decoder = ParadoxCameraDecoder(hass, create_fake_ffmpeg(tmp_path), stream_source, extra_cmd='-r 1')
+
+    decoder.acquire()
+    decoder.acquire()
+    assert await decoder.async_next_frame() == FFMPEG_FRAME
+    assert decoder.frame == FFMPEG_FRAME
+
+    await decoder.async_release()
+    assert decoder.is_running
+
+    await decoder.async_release()
+    assert not decoder.is_running
+    assert decoder.frame is None
+    assert read_ffmpeg_args(tmp_path) == [f"-i {STREAM_URL} -an -c:v mjpeg -r 1 -f mpjpeg -"]
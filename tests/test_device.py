@@ -0,0 +1,164 @@
+"""Tests for the Paradox module abstraction."""
+import asyncio
+from datetime import timedelta
+
+import pytest
+from aiohttp import ClientConnectionError
+from homeassistant.const import CONF_DEVICE, CONF_TIMEOUT
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.paradox.const import CONF_CAMERA, DEFAULT_BREAKER_THRESHOLD, DEFAULT_SESSION_REFRESH
+from custom_components.paradox.device import ModuleUnreachableError, ParadoxCommandQueue, ParadoxDevice
+
+from . import create_config_entry, save_module_data
+from .simulator import FAILURE_DROP, FAILURE_TIMEOUT
+
+
+@pytest.fixture
+async def device(hass, simulator):
+    """Return a module set up against the simulator."""
+    device = ParadoxDevice(hass, create_config_entry(hass, simulator, domains=[CONF_CAMERA]))
+    assert await device.async_setup()
+    await hass.async_block_till_done()
+
+    yield device
+
+    await device.async_unload()
+
+
+async def test_setup(device, simulator):
+    """Test the device and panel info come from the login."""
+    assert device.available
+    assert device.device_info.serial == simulator.serial
+    assert device.device_info.sw_version == '1.34.4'
+    assert device.panel_info.serial == f"ca{simulator.serial}"
+    assert device.panel_info.sw_version == '7.50'
+
+
+async def test_area_commands_are_batched(device, simulator):
+    """Test commands queued together are sent in one request, the last one per area wins."""
+    results = await asyncio.gather(
+        device.async_queue_area_command(1, 2),
+        device.async_queue_area_command(2, 3),
+        device.async_queue_area_command(1, 6),
+    )
+
+    assert results == [True, True, True]
+    assert simulator.commands['areacontrol'] == [[
+        {'AreaID': 1, 'AreaCommand': 6, 'ForceZones': False},
+        {'AreaID': 2, 'AreaCommand': 3, 'ForceZones': False},
+    ]]
+
+
+async def test_command_queue_error(hass):
+    """Test the callers waiting on a queue get the error of the request, or False when it is cancelled."""
+    async def send(commands):
+        raise ClientConnectionError()
+
+    queue = ParadoxCommandQueue(hass, send, window=0)
+    with pytest.raises(ClientConnectionError):
+        await queue.async_queue(1, {})
+
+    queue = ParadoxCommandQueue(hass, send, window=60)
+    result = hass.async_create_task(queue.async_queue(1, {}))
+    await asyncio.sleep(0)
+    queue.async_cancel()
+    assert await result is False
+
+
+async def test_rejected_session_is_renewed(device, simulator):
+    """Test a call rejected by the module logs in again and is retried once."""
+    simulator.expire_session()
+
+    assert await device.async_set_recording(True)
+    assert simulator.recording
+    assert simulator.requests['login'] == 2
+    assert device.relogins == 1
+
+
+async def test_area_command_on_expired_session(device, simulator):
+    """Test an area command refused for an expired session is sent again with a new session."""
+    simulator.expire_session()
+
+    assert await device.async_queue_area_command(1, 2)
+    assert simulator.requests['areacontrol'] == 2
+    assert simulator.commands['areacontrol'] == [[{'AreaID': 1, 'AreaCommand': 2, 'ForceZones': False}]]
+    assert simulator.requests['login'] == 2
+    assert device.relogins == 1
+
+
+async def test_polling_does_not_keep_the_session_alive(device, simulator):
+    """Test pingstatus doesn't use the session, the keepalive refreshes it once it gets old."""
+    last_used = device._session_last_used
+    await device.async_update_alarm_panel()
+    assert device._session_last_used == last_used
+
+    device._session_last_used -= timedelta(seconds=DEFAULT_SESSION_REFRESH)
+    await device._async_keepalive()
+    assert simulator.requests['getstatus'] == 1
+    assert simulator.requests['login'] == 1
+    assert device._session_last_used > last_used
+
+
+async def test_recording_state_is_not_sent_twice(device, simulator):
+    """Test record on demand is only commanded when the state changes."""
+    assert await device.async_set_recording(True)
+    assert await device.async_set_recording(True)
+    assert await device.async_set_recording(False)
+
+    assert simulator.requests['rod'] == 2
+    assert not simulator.recording
+
+
+async def test_stream_source(device, simulator):
+    """Test the stream url is the variant of the profile and is cached for the session."""
+    source = await device.async_stream_source()
+    assert source.endswith(f"/hls/{simulator.session_key}/normal/index.m3u8")
+
+    assert await device.async_stream_source() == source
+    assert simulator.requests['vod'] == 1
+
+    playlist = await device.async_get_stream_data(source)
+    assert playlist.startswith(b'#EXTM3U')
+
+
+async def test_circuit_breaker(device, simulator):
+    """Test calls fail fast without reaching the module once it is unreachable."""
+    simulator.fail('pingstatus', FAILURE_DROP, DEFAULT_BREAKER_THRESHOLD)
+    for _ in range(DEFAULT_BREAKER_THRESHOLD):
+        with pytest.raises(ClientConnectionError):
+            await device._async_api_call('pingstatus')
+
+    assert device.breaker_open
+    with pytest.raises(ModuleUnreachableError):
+        await device._async_api_call('pingstatus')
+    assert simulator.requests['pingstatus'] == DEFAULT_BREAKER_THRESHOLD
+
+
+async def test_timeout(hass, simulator):
+    """Test a module that doesn't answer in time fails the update and counts a timeout."""
+    device = ParadoxDevice(hass, create_config_entry(hass, simulator, options={CONF_DEVICE: {CONF_TIMEOUT: 1}}))
+    assert await device.async_setup()
+
+    simulator.fail('pingstatus', FAILURE_TIMEOUT)
+    with pytest.raises(UpdateFailed):
+        await device.async_update_alarm_panel()
+    assert device.stats['pingstatus'].timeout == 1
+
+    assert await device.async_update_alarm_panel()
+    await device.async_unload()
+
+
+async def test_restored_module_fails_fast(hass, hass_storage, simulator):
+    """Test a module restored from the saved data refuses calls until it is connected."""
+    entry = create_config_entry(hass, simulator)
+    save_module_data(hass_storage, entry, simulator, {})
+
+    device = ParadoxDevice(hass, entry)
+    assert await device.async_restore()
+    assert not device.connected
+
+    assert not await device.async_queue_area_command(1, 2)
+    with pytest.raises(ClientConnectionError):
+        await device.async_get_stream_data(f"http://{simulator.host}:{simulator.port}/")
+    assert sum(simulator.requests.values()) == 0
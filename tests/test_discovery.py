@@ -0,0 +1,88 @@
+"""Tests for the discovery of Paradox modules."""
+import asyncio
+import socket
+from typing import Tuple
+from unittest.mock import patch
+from urllib.parse import urlencode
+
+from custom_components.paradox.config_flow import async_discovery
+from custom_components.paradox.discovery import DISCOVERY_REQUEST, DISCOVERY_RESPONSE, async_discover_modules
+
+# The modules answer to the port of the announcement, the fake module listens on its own loopback
+# address so that it gets the announcement and the discovery gets the answer
+MODULE_HOST = '127.0.0.2'
+MODULE = {'type': 'HD77', 'sn': '0000a1b2', 'ip': MODULE_HOST, 'portweb': '80', 'mac': '00:19:ba:0a:1b:2c',
+          'ZoneLabel': 'Front door '}
+
+
+class FakeModuleProtocol(asyncio.DatagramProtocol):
+    """Answer the discovery announcements like a Paradox module."""
+
+    def __init__(self) -> None:
+        """Initialize"""
+        self.transport = None
+        self.announcements = 0
+
+    def connection_made(self, transport: asyncio.DatagramTransport) -> None:
+        """Keep the transport to answer."""
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        """Answer an announcement."""
+        if data == DISCOVERY_REQUEST:
+            self.announcements += 1
+            self.transport.sendto(f"{DISCOVERY_RESPONSE}{urlencode(MODULE)}".encode(), addr)
+
+
+def get_free_port() -> int:
+    """Return a free UDP port."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def test_discover_modules():
+    """Test a module is found once and the discovery stops when no other module answers."""
+    loop = asyncio.get_running_loop()
+    port = get_free_port()
+    transport, fake_module = await loop.create_datagram_endpoint(
+        FakeModuleProtocol, local_addr=(MODULE_HOST, port), reuse_port=True
+    )
+
+    start = loop.time()
+    try:
+        modules = [module async for module in async_discover_modules(
+            timeout=5, idle_timeout=1, host=MODULE_HOST, port=port
+        )]
+    finally:
+        transport.close()
+
+    assert modules == [MODULE]
+    assert fake_module.announcements > 1
+    assert loop.time() - start < 2
+
+
+async def discover_nothing(*args, **kwargs):
+    """Discover no module."""
+    return
+    yield
+
+
+async def discover_module(*args, **kwargs):
+    """Discover the fake module."""
+    yield MODULE
+
+
+async def test_discovery_cache(hass):
+    """Test the modules found are cached, but not an empty result."""
+    with patch('custom_components.paradox.config_flow.async_discover_modules', side_effect=discover_nothing) as mock:
+        assert await async_discovery(hass) == []
+        assert await async_discovery(hass) == []
+    assert mock.call_count == 2
+
+    with patch('custom_components.paradox.config_flow.async_discover_modules', side_effect=discover_module) as mock:
+        devices = await async_discovery(hass)
+        assert await async_discovery(hass) == devices
+    assert mock.call_count == 1
+    assert devices[0].name == 'Front door'
+    assert devices[0].serial == MODULE['sn']
@@ -0,0 +1,124 @@
+"""Tests for the setup and the alarm panel coordinator of the Paradox integration."""
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import (STATE_ALARM_ARMED_AWAY, STATE_ALARM_ARMED_HOME,
+                                 STATE_ALARM_DISARMED, STATE_OFF)
+
+from custom_components.paradox.const import DEFAULT_FAST_SCAN_INTERVAL, DEFAULT_SCAN_JITTER
+
+from . import SLOW_POLL, async_setup_module, create_config_entry, get_coordinator, get_module, save_module_data
+from .simulator import FAILURE_DROP
+
+
+async def test_setup_unload_entry(hass, simulator):
+    """Test the entities are created from the module data and the entry unloads."""
+    entry = await async_setup_module(hass, simulator)
+
+    assert entry.state == ConfigEntryState.LOADED
+    assert hass.states.get('alarm_control_panel.area_1').state == STATE_ALARM_DISARMED
+    assert hass.states.get('binary_sensor.zone_1').state == STATE_OFF
+    assert hass.states.get('binary_sensor.zone_2').state == STATE_OFF
+    assert hass.states.get('switch.pgm_1').state == STATE_OFF
+    # Entities are updated by the coordinator
+    for domain, entity_id in (('alarm_control_panel', 'area_1'), ('binary_sensor', 'zone_1'), ('switch', 'pgm_1')):
+        assert hass.data[domain].get_entity(f"{domain}.{entity_id}").should_poll is False
+    assert simulator.requests['login'] == 1
+    assert simulator.requests['pingstatus'] == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state == ConfigEntryState.NOT_LOADED
+
+
+async def test_alarm_only_entry_skips_ffmpeg(hass, simulator):
+    """Test ffmpeg is only set up with the camera."""
+    await async_setup_module(hass, simulator)
+
+    assert 'ffmpeg' not in hass.config.components
+
+
+async def test_push_updates_entities(hass, simulator):
+    """Test alarm panel data pushed by the module reaches the entities without waiting for a poll."""
+    entry = await async_setup_module(hass, simulator, options=SLOW_POLL)
+
+    simulator.set_area(1, ArmingLevelID=1)
+    await get_module(hass, entry).async_push_alarm_panel()
+    await hass.async_block_till_done()
+
+    assert hass.states.get('alarm_control_panel.area_1').state == STATE_ALARM_ARMED_AWAY
+    assert simulator.requests['pingstatus'] == 2
+
+
+async def test_command_pushes_new_state(hass, simulator):
+    """Test an area command is sent to the module and the new state is pushed back."""
+    entry = await async_setup_module(hass, simulator, options=SLOW_POLL)
+
+    await hass.services.async_call(
+        'alarm_control_panel', 'alarm_arm_home', {'entity_id': 'alarm_control_panel.area_1'}, blocking=True
+    )
+    await hass.async_block_till_done()
+
+    assert simulator.commands['areacontrol'] == [[{'AreaID': 1, 'AreaCommand': 3, 'ForceZones': False}]]
+    assert hass.states.get('alarm_control_panel.area_1').state == STATE_ALARM_ARMED_HOME
+    # The pushed state is the only extra poll, and the next one comes at the fast interval
+    assert simulator.requests['pingstatus'] == 2
+    assert get_coordinator(hass, entry).update_interval.total_seconds() <= \
+        DEFAULT_FAST_SCAN_INTERVAL * (1 + DEFAULT_SCAN_JITTER)
+
+
+async def test_only_changed_entities_are_written(hass, simulators):
+    """Test a refresh only writes the state of the entities whose area, zone or PGM changed."""
+    simulator = await simulators(areas=4, zones=8, pgms=2)
+    entry = await async_setup_module(hass, simulator, options=SLOW_POLL)
+
+    changed = []
+    hass.bus.async_listen('state_changed', lambda event: changed.append(event.data['entity_id']))
+
+    simulator.set_area(2, ArmingLevelID=1)
+    await get_coordinator(hass, entry).async_refresh()
+    await hass.async_block_till_done()
+
+    assert changed == ['alarm_control_panel.area_2']
+
+
+async def test_unreachable_module(hass, simulator):
+    """Test a dropped connection fails the update and the next poll recovers."""
+    entry = await async_setup_module(hass, simulator, options=SLOW_POLL)
+    coordinator = get_coordinator(hass, entry)
+
+    simulator.fail('pingstatus', FAILURE_DROP)
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+
+
+async def test_fast_start(hass, hass_storage, simulator):
+    """Test the entities are created from the saved topology and the module connects in the background."""
+    entry = create_config_entry(hass, simulator, options=SLOW_POLL)
+    save_module_data(hass_storage, entry, simulator, {
+        'AreaStatus': [{'AreaId': 1, 'AreaLabel': 'Area 1'}],
+        'ZoneStatus': [{'ZoneId': 1, 'ZoneLabel': 'Zone 1'}],
+        'PGMStatus': [],
+    })
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    assert simulator.requests['login'] == 0
+
+    await hass.async_block_till_done()
+    assert simulator.requests['login'] == 1
+    assert hass.states.get('alarm_control_panel.area_1').state == STATE_ALARM_DISARMED
+    assert hass.states.get('binary_sensor.zone_1').state == STATE_OFF
+
+
+async def test_no_fast_start_without_topology(hass, hass_storage, simulator):
+    """Test a module saved without topology, e.g. when only its camera was enabled, is set up first."""
+    entry = create_config_entry(hass, simulator, options=SLOW_POLL)
+    save_module_data(hass_storage, entry, simulator, None)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    assert simulator.requests['login'] == 1
+
+    await hass.async_block_till_done()
+    assert hass.states.get('alarm_control_panel.area_1').state == STATE_ALARM_DISARMED
+    assert hass.states.get('switch.pgm_1').state == STATE_OFF
@@ -0,0 +1,30 @@
+"""Tests for the parser of the Paradox camera playlists."""
+from custom_components.paradox.models import StreamVariant
+from custom_components.paradox.playlist import nearest_variant, parse_variants
+
+from . import HD77_PLAYLIST
+
+
+def test_parse_variants():
+    """Test the variants of a master playlist are read in order."""
+    assert parse_variants(HD77_PLAYLIST) == [
+        StreamVariant(uri='http://192.168.1.20:80/hls/5f2b1c0e/low/index.m3u8', bandwidth=128000),
+        StreamVariant(uri='http://192.168.1.20:80/hls/5f2b1c0e/normal/index.m3u8', bandwidth=256000),
+        StreamVariant(uri='http://192.168.1.20:80/hls/5f2b1c0e/high/index.m3u8', bandwidth=512000),
+    ]
+
+
+def test_parse_media_playlist():
+    """Test a media playlist has no variants."""
+    assert parse_variants("#EXTM3U\n#EXT-X-TARGETDURATION:2\n#EXTINF:2.000,\n1.ts\n") == []
+
+
+def test_nearest_variant():
+    """Test the variant closest to the bandwidth is picked, the lower one on a tie."""
+    variants = parse_variants(HD77_PLAYLIST)
+
+    assert nearest_variant(variants, 256000).bandwidth == 256000
+    assert nearest_variant(variants, 250000).bandwidth == 256000
+    assert nearest_variant(variants, 1000000).bandwidth == 512000
+    assert nearest_variant(variants, 192000).bandwidth == 128000
+    assert nearest_variant([], 256000) is None
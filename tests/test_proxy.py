@@ -0,0 +1,44 @@
+"""Tests for the HLS proxy of the Paradox camera stream."""
+from custom_components.paradox.proxy import ParadoxStreamProxy
+
+
+def media_playlist(first: int, variant: str) -> str:
+    """Return a media playlist of the module with three segments."""
+    lines = ['#EXTM3U', '#EXT-X-TARGETDURATION:2', f"#EXT-X-MEDIA-SEQUENCE:{first}"]
+    for sequence in range(first, first + 3):
+        lines += ['#EXTINF:2.000,', f"{variant}-{sequence}.ts"]
+    return '\n'.join(lines) + '\n'
+
+
+def segments(playlist: bytes) -> list:
+    """Return the segment lines of a rewritten playlist."""
+    return [line for line in playlist.decode().splitlines() if line and not line.startswith('#EXTINF')]
+
+
+async def test_rewrite_playlist(hass):
+    """Test the segments are renumbered by the proxy and the sequence keeps increasing."""
+    proxy = ParadoxStreamProxy(hass, None)
+    source = 'http://module/hls/key/low/index.m3u8'
+
+    assert segments(proxy.rewrite_playlist(source, media_playlist(100, 'low'))) == [
+        '#EXTM3U', '#EXT-X-MEDIA-SEQUENCE:1', '#EXT-X-TARGETDURATION:2', '1.ts', '2.ts', '3.ts'
+    ]
+    assert segments(proxy.rewrite_playlist(source, media_playlist(101, 'low'))) == [
+        '#EXTM3U', '#EXT-X-MEDIA-SEQUENCE:2', '#EXT-X-TARGETDURATION:2', '2.ts', '3.ts', '4.ts'
+    ]
+
+
+async def test_rewrite_playlist_variant_switch(hass):
+    """Test a discontinuity marks the first segment of a new variant until it leaves the playlist."""
+    proxy = ParadoxStreamProxy(hass, None)
+    proxy.rewrite_playlist('http://module/hls/key/low/index.m3u8', media_playlist(100, 'low'))
+    source = 'http://module/hls/key/high/index.m3u8'
+
+    assert segments(proxy.rewrite_playlist(source, media_playlist(7, 'high'))) == [
+        '#EXTM3U', '#EXT-X-MEDIA-SEQUENCE:4', '#EXT-X-TARGETDURATION:2',
+        '#EXT-X-DISCONTINUITY', '4.ts', '5.ts', '6.ts'
+    ]
+    assert segments(proxy.rewrite_playlist(source, media_playlist(8, 'high'))) == [
+        '#EXTM3U', '#EXT-X-MEDIA-SEQUENCE:5', '#EXT-X-DISCONTINUITY-SEQUENCE:1', '#EXT-X-TARGETDURATION:2',
+        '5.ts', '6.ts', '7.ts'
+    ]
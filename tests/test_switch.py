@@ -0,0 +1,37 @@
+"""Tests for the PGM switches of the Paradox integration."""
+from homeassistant.const import ATTR_ASSUMED_STATE, STATE_OFF, STATE_ON
+
+from . import SLOW_POLL, async_setup_module
+from .simulator import FAILURE_REJECT
+
+
+async def async_turn_on(hass) -> list:
+    """Turn the PGM on and return the states the switch went through, and if they were assumed."""
+    states = []
+    hass.bus.async_listen('state_changed', lambda event: states.append(
+        (event.data['new_state'].state, event.data['new_state'].attributes.get(ATTR_ASSUMED_STATE, False))
+    ))
+
+    await hass.services.async_call('switch', 'turn_on', {'entity_id': 'switch.pgm_1'}, blocking=True)
+    await hass.async_block_till_done()
+    return states
+
+
+async def test_turn_on(hass, simulator):
+    """Test the switch is on at once, until the panel confirms the command."""
+    await async_setup_module(hass, simulator, options=SLOW_POLL)
+
+    assert await async_turn_on(hass) == [(STATE_ON, True), (STATE_ON, False)]
+    assert simulator.commands['pgmcontrol'] == [[{'PGMID': 1, 'SerialNo': '0000000101', 'PGMCommand': 0}]]
+
+
+async def test_rejected_command_rolls_back(hass, simulator):
+    """Test the optimistic state is rolled back when the module refuses the command."""
+    await async_setup_module(hass, simulator, options=SLOW_POLL)
+    # The first refusal renews the session and the command is sent again
+    simulator.fail('pgmcontrol', FAILURE_REJECT, 2)
+
+    assert await async_turn_on(hass) == [(STATE_ON, True), (STATE_OFF, False)]
+    assert simulator.requests['pgmcontrol'] == 2
+    assert simulator.commands['pgmcontrol'] == []
+    assert hass.states.get('switch.pgm_1').state == STATE_OFF